@@ -4,6 +4,7 @@ import subprocess
 import logging
 import shutil
 import time
+from contextlib import suppress
 from typing import Dict, List, Tuple, Optional, Any
 
 logger = logging.getLogger('MediaCompressor.CompressionEngine')
@@ -16,6 +17,7 @@ class CompressionEngine:
         self.config = config
         self.quality_validator = quality_validator
         self.dependencies_checked = False
+        self._argv_cache: Dict[Tuple[str, ...], List[str]] = {}  # HandBrake argv templates by option set
     
     def check_dependencies(self) -> bool:
         """Check if all required external tools are available."""
@@ -79,6 +81,29 @@ class CompressionEngine:
             "content_type": content_type
         }
     
+    def _build_handbrake_cmd(self, file_path: str, temp_output: str, settings: Dict[str, Any]) -> List[str]:
+        """Build the HandBrakeCLI argv from a cached template, splicing in the paths."""
+        compression = self.config["compression"]
+        key = (
+            compression["handbrake_path"],
+            settings["nvenc_options"],
+            compression["audio_options"],
+            compression["subtitle_options"]
+        )
+        
+        template = self._argv_cache.get(key)
+        if template is None:
+            template = [compression["handbrake_path"], "-i", "", "-o", ""]
+            template.extend(settings["nvenc_options"].split())
+            template.extend(compression["audio_options"].split())
+            template.extend(compression["subtitle_options"].split())
+            self._argv_cache[key] = template
+        
+        handbrake_cmd = template[:]
+        handbrake_cmd[2] = file_path
+        handbrake_cmd[4] = temp_output
+        return handbrake_cmd
+    
     def run_handbrake(self, file_path: str, temp_output: str, settings: Dict[str, Any], 
                      status_callback=None, paused_check=None, running_check=None) -> bool:
         """
@@ -92,17 +117,8 @@ class CompressionEngine:
             paused_check: Optional function to check if compression is paused
             running_check: Optional function to check if compression should still be running
         """
-        # Build HandBrakeCLI command
-        handbrake_cmd = [
-            self.config["compression"]["handbrake_path"],
-            "-i", file_path,
-            "-o", temp_output
-        ]
-        
-        # Add compression options
-        handbrake_cmd.extend(settings["nvenc_options"].split())
-        handbrake_cmd.extend(self.config["compression"]["audio_options"].split())
-        handbrake_cmd.extend(self.config["compression"]["subtitle_options"].split())
+        # Build HandBrakeCLI command with compression options
+        handbrake_cmd = self._build_handbrake_cmd(file_path, temp_output, settings)
         
         # Add special handling for large high-bitrate files
         if os.path.getsize(file_path) > 10 * 1024 * 1024 * 1024:  # If larger than 10GB
@@ -171,6 +187,11 @@ class CompressionEngine:
             logger.error(f"Error during compression: {str(e)}")
             return False
     
+    def discard_temp_output(self, temp_output: str):
+        """Remove a temporary output file, ignoring files that are already gone."""
+        with suppress(OSError):
+            os.remove(temp_output)
+    
     def finalize_compression(self, file_path: str, temp_output: str, original_size: int, 
                            verify_integrity=None, status_callback=None) -> Dict[str, Any]:
         """
@@ -190,11 +211,7 @@ class CompressionEngine:
         # Verify the compressed file exists and is valid
         if not os.path.exists(temp_output) or os.path.getsize(temp_output) == 0:
             logger.error("Compression produced an empty or missing file")
-            try:
-                if os.path.exists(temp_output):
-                    os.remove(temp_output)
-            except OSError:
-                pass
+            self.discard_temp_output(temp_output)
             return {
                 "status": "error",
                 "error": "Compression produced an empty or missing file",
@@ -229,10 +246,7 @@ class CompressionEngine:
                 status_callback("cleaning up", stage="skipping file")
             
             # Clean up
-            try:
-                os.remove(temp_output)
-            except OSError:
-                pass
+            self.discard_temp_output(temp_output)
             
             return {
                 "status": "skipped",
@@ -250,10 +264,7 @@ class CompressionEngine:
         # Verify integrity of compressed file before replacing
         if self.config["recovery"]["verify_files"] and verify_integrity and not verify_integrity(temp_output):
             logger.error(f"Compressed file integrity check failed for {temp_output}")
-            try:
-                os.remove(temp_output)
-            except OSError:
-                pass
+            self.discard_temp_output(temp_output)
             return {
                 "status": "error",
                 "error": "Compressed file integrity verification failed",
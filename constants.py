@@ -37,7 +37,11 @@ DEFAULT_CONFIG = {
         "enabled": True,
         "method": "vmaf",  # or "ssim"
         "threshold": 90,   # Minimum quality score
-        "sample_duration": 60  # Sample duration in seconds for quality check
+        "sample_duration": 60,  # Sample duration in seconds for quality check
+        "n_subsample": 4,       # VMAF scores every Nth frame of the sample (1 = every frame)
+        "vmaf_threads": None,   # libvmaf worker threads; None uses every CPU
+        "downscale_for_metric": True,  # Compare sources above 1440p at 1080p width
+        "vmaf_model_path": None        # VMAF model file; None uses libvmaf's built-in vmaf_v0.6.1
     },
     "database_path": "media_compression.db",
     "backup_path": "media_compression_backup.db",  # Added backup path for DB
@@ -45,6 +49,7 @@ DEFAULT_CONFIG = {
     "min_size_mb": 200,   # Only compress files larger than this size
     "size_reduction_threshold": 0.2,  # Expected size reduction (20%)
     "max_concurrent_jobs": 2,
+    "use_free_threaded": False,       # Expect a free-threaded (no-GIL) Python for compression workers
     "max_concurrent_scans": 4,        # How many directories to scan concurrently
     "scan_batch_size": 1000,          # How many files to process in each database batch
     "compression_queue_size": 1000,   # Maximum number of files in the compression queue
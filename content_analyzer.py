@@ -20,7 +20,8 @@ class ContentAnalyzer:
     def get_video_info(self, file_path: str) -> Dict[str, Any]:
         """Get video information using ffprobe with robust error handling."""
         if self.quality_validator:
-            return self.quality_validator._get_video_info(file_path)
+            # Only the duration is used here, so skip the trailing streams
+            return self.quality_validator._get_video_info(file_path, fast=True)
         else:
             # Fallback if quality validator is not available
             try:
@@ -1,11 +1,96 @@
 import os
+import json
+import mmap
 import hashlib
 import subprocess
 import logging
 from typing import Optional
 
+try:
+    import xxhash
+except ImportError:  # Optional dependency; checksums fall back to MD5
+    xxhash = None
+
 logger = logging.getLogger('MediaCompressor.FileProcessor')
 
+# Checksums are tagged with their algorithm so stored values stay comparable.
+# Untagged values are legacy MD5 digests.
+XXH3_CHECKSUM_PREFIX = "xxh3:"
+
+# Algorithm used for checksums that are not compared against a stored value
+DEFAULT_CHECKSUM_ALGORITHM = "xxh3" if xxhash is not None else "md5"
+
+def checksum_algorithm(checksum: Optional[str]) -> str:
+    """Return the algorithm ("xxh3" or "md5") that produced a stored checksum."""
+    if checksum and checksum.startswith(XXH3_CHECKSUM_PREFIX):
+        return "xxh3"
+    return "md5"
+
+def _advise_sequential(mapping: mmap.mmap):
+    """Ask the kernel to read ahead aggressively on a mapping, where madvise is supported."""
+    if hasattr(mapping, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+
+def compute_file_checksum(file_path: str, algorithm: Optional[str] = None) -> str:
+    """
+    Calculate a fast file checksum by hashing the whole file, or only the first
+    and last 4MB for files of 8MB or more.
+    
+    Args:
+        file_path: Path to the file for checksum calculation
+        algorithm: "xxh3" or "md5"; defaults to DEFAULT_CHECKSUM_ALGORITHM.
+            Pass checksum_algorithm(stored) to compare against a stored value.
+    
+    Raises:
+        OSError: If the file cannot be read
+    """
+    if algorithm is None:
+        algorithm = DEFAULT_CHECKSUM_ALGORITHM
+    
+    if algorithm == "xxh3" and xxhash is not None:
+        hasher, prefix = xxhash.xxh3_64(), XXH3_CHECKSUM_PREFIX
+    else:
+        hasher, prefix = hashlib.md5(), ""
+    
+    file_size = os.path.getsize(file_path)
+    
+    # For small files, hash the entire file
+    if file_size < 8 * 1024 * 1024:  # Less than 8MB
+        # Stream through one reused buffer rather than reading the file into a new bytes object
+        with open(file_path, 'rb') as f:
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                hashlib.file_digest(f, lambda: hasher)
+            else:
+                buffer = bytearray(65536)
+                view = memoryview(buffer)
+                while (count := f.readinto(buffer)):
+                    hasher.update(view[:count])
+        return prefix + hasher.hexdigest()
+    
+    # For larger files, hash the first and last 4MB, memory-mapped so the
+    # hasher reads straight from the page cache without extra copies
+    window = 4 * 1024 * 1024
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        with mmap.mmap(fd, window, access=mmap.ACCESS_READ) as head:
+            _advise_sequential(head)
+            hasher.update(head)
+        
+        # mmap offsets must be aligned to the allocation granularity
+        granularity = mmap.ALLOCATIONGRANULARITY
+        tail_offset = ((file_size - window) // granularity) * granularity
+        with mmap.mmap(fd, file_size - tail_offset, access=mmap.ACCESS_READ, offset=tail_offset) as tail:
+            _advise_sequential(tail)
+            with memoryview(tail) as view:
+                hasher.update(view[len(view) - window:])
+    except ValueError as e:
+        # mmap raises ValueError when the file shrank after it was stat'ed
+        raise OSError(f"File changed while hashing {file_path}: {str(e)}") from e
+    finally:
+        os.close(fd)
+    
+    return prefix + hasher.hexdigest()
+
 class FileProcessor:
     """Process media files with validation and checksum utilities."""
     
@@ -31,15 +116,15 @@ class FileProcessor:
                 return False
             
             # Try to read the file headers with ffprobe - using a more reliable approach
-            # Just check if the format can be detected, nothing more
+            # Just check if the format can be detected, nothing more. Only the
+            # container name is requested so ffprobe skips tag and stream output.
             cmd = ["ffprobe", "-v", "error", "-hide_banner", "-of", "json", 
-                   "-show_format", "-i", file_path]
+                   "-show_entries", "format=format_name", "-i", file_path]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)  # Increased timeout
             
             # We don't check returncode because some files might return warnings
             # but still be valid. Instead, we check if we got format information.
             try:
-                import json
                 data = json.loads(result.stdout)
                 if "format" not in data:
                     logger.error(f"File format check failed for {file_path}: No format section in output")
@@ -80,31 +165,13 @@ class FileProcessor:
     def get_file_checksum(self, file_path: str) -> str:
         """
         Calculate file checksum using first and last 4MB for speed.
+        Uses xxh3 when available; see compute_file_checksum.
         
         Args:
             file_path: Path to the file for checksum calculation
         """
         try:
-            file_size = os.path.getsize(file_path)
-            
-            # For small files, hash the entire file
-            if file_size < 8 * 1024 * 1024:  # Less than 8MB
-                with open(file_path, 'rb') as f:
-                    return hashlib.md5(f.read()).hexdigest()
-            
-            # For larger files, hash the first and last 4MB
-            md5 = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                # Read first 4MB
-                data = f.read(4 * 1024 * 1024)
-                md5.update(data)
-                
-                # Seek to last 4MB
-                f.seek(-4 * 1024 * 1024, os.SEEK_END)
-                data = f.read(4 * 1024 * 1024)
-                md5.update(data)
-            
-            return md5.hexdigest()
+            return compute_file_checksum(file_path)
         except Exception as e:
             logger.error(f"Error calculating checksum for {file_path}: {str(e)}")
             return ""
@@ -140,7 +207,6 @@ class FileProcessor:
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
             
             if result.returncode == 0:
-                import json
                 data = json.loads(result.stdout)
                 if "streams" in data and data["streams"]:
                     stream = data["streams"][0]
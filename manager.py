@@ -119,6 +119,7 @@ class MediaCompressionManager:
                 self.db.backup_database()
             except Exception as e:
                 logger.error(f"Error during final database backup: {e}")
+            self.db.close()
     
     def _deep_update(self, d: Dict[str, Any], u: Dict[str, Any]) -> None:
         """Recursively update nested dictionaries."""
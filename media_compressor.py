@@ -1,14 +1,13 @@
 import os
+import sys
 import time
 import threading
 import logging
-import datetime
+import functools
 import concurrent
-import queue
-import sqlite3
+import collections
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple, Optional, Any, TypedDict
-from contextlib import contextmanager
 
 from content_analyzer import ContentAnalyzer
 from compression_engine import CompressionEngine
@@ -28,13 +27,37 @@ class JobInfo(TypedDict):
     status: str
     estimated_time: int
     eta: Optional[float]
+    progress_history: "collections.deque[Tuple[float, float]]"
+    progress_rate: Optional[float]
     current_stage: str
+    db_inprogress_written: bool
+
+def _iso_timestamp(epoch: Optional[float] = None) -> str:
+    """Format an epoch time (default now) as a local ISO 8601 string with second resolution."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(epoch))
+
+@functools.lru_cache(maxsize=1024)
+def _format_seconds(seconds: int) -> str:
+    """Format a whole number of seconds to a human readable string."""
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, sec = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {sec}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m"
 
 class MediaCompressor:
     """
     Media Compressor class that takes files from the database and
     compresses them using HandBrakeCLI.
     """
+    # Smoothing factor for the per-job progress rate used to estimate ETAs
+    _ETA_EWMA_ALPHA = 0.3
+    
+    # Final statuses from pause/stop that must not wait for a batch flush
+    IMMEDIATE_STATUSES = (STATUS_PAUSED, STATUS_PENDING)
+    
     def __init__(self, config: Dict, db):
         """Initialize the media compressor with configuration."""
         self.config = config
@@ -66,8 +89,19 @@ class MediaCompressor:
         # Dynamic Job Management
         self.paused = False
         self.running = True
-        self.job_queue = queue.PriorityQueue()
+        self._resume_event = threading.Event()  # Set while compression may proceed
+        self._resume_event.set()
         self.job_history = {}  # Track job history for priority
+        
+        # Short-lived cache of get_compression_status() so UI polling does not
+        # contend with progress callbacks on jobs_lock
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_cache_ts = 0.0
+        self._db_stats_cache: Tuple[float, Optional[Dict]] = (0.0, None)  # (monotonic timestamp, stats)
+        
+        # Final file statuses queued by workers and flushed in batches
+        self._pending_updates: List[Tuple[str, str, int, Dict[str, Any]]] = []
+        self._pending_lock = threading.Lock()
     
     def set_quality_validator(self, quality_validator):
         """Set the quality validator after initialization to avoid circular imports."""
@@ -75,59 +109,48 @@ class MediaCompressor:
         self.content_analyzer.quality_validator = quality_validator
         self.compression_engine.quality_validator = quality_validator
     
-    @contextmanager
-    def _db_connection(self):
-        """Context manager for database connections to ensure proper cleanup."""
-        conn = None
-        try:
-            conn = sqlite3.connect(self.config["database_path"])
-            yield conn
-        finally:
-            if conn:
-                conn.close()
-    
     def pause_compression(self):
         """Pause all active compression jobs."""
         with self.jobs_lock:
             self.paused = True
-            # Update file statuses
-            for job_info in self.active_jobs.values():
-                file_path = job_info["file_path"]
-                self.db.update_file_status(file_path, STATUS_PAUSED)
-            
-            logger.info("Compression paused")
-            self.db.log_system_event("compression_paused", "Compression jobs paused by user", "info")
+            self._resume_event.clear()
+            self._status_cache = None
+            paths = [job_info["file_path"] for job_info in self.active_jobs.values()]
+        
+        # Update file statuses outside jobs_lock so progress callbacks are not
+        # held up behind the database write
+        self.db.update_files_status_many(paths, STATUS_PAUSED)
+        
+        logger.info("Compression paused")
+        self.db.log_system_event("compression_paused", "Compression jobs paused by user", "info")
     
     def resume_compression(self):
         """Resume compression jobs."""
         with self.jobs_lock:
             self.paused = False
-            # Reset paused file statuses
-            with self._db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE processed_files SET status = ? WHERE status = ?",
-                    (STATUS_PENDING, STATUS_PAUSED)
-                )
-                conn.commit()
-            
-            logger.info("Compression resumed")
-            self.db.log_system_event("compression_resumed", "Compression jobs resumed", "info")
+            self._resume_event.set()
+            self._status_cache = None
+        
+        # Reset paused file statuses
+        self.db.replace_status(STATUS_PAUSED, STATUS_PENDING)
+        
+        logger.info("Compression resumed")
+        self.db.log_system_event("compression_resumed", "Compression jobs resumed", "info")
     
     def stop_compression(self):
         """Stop all compression jobs immediately."""
         with self.jobs_lock:
             self.running = False
             self.paused = True  # Also pause to stop current processing
-            
-            # Mark all active jobs as interrupted
-            for job_info in self.active_jobs.values():
-                file_path = job_info["file_path"]
-                self.db.update_file_status(file_path, STATUS_PENDING, 
-                                          error_message="Interrupted by user")
-            
-            logger.info("Stopping compression jobs immediately")
-            self.db.log_system_event("compression_stopped", "Compression jobs stopped by user", "info")
+            self._resume_event.set()  # Wake the queue loop so it can observe the stop
+            self._status_cache = None
+            paths = [job_info["file_path"] for job_info in self.active_jobs.values()]
+        
+        # Mark all active jobs as interrupted
+        self.db.update_files_status_many(paths, STATUS_PENDING, error_message="Interrupted by user")
+        
+        logger.info("Stopping compression jobs immediately")
+        self.db.log_system_event("compression_stopped", "Compression jobs stopped by user", "info")
     
     def prioritize_file(self, file_path: str, priority: int = 10):
         """Set a high priority for a specific file."""
@@ -135,31 +158,24 @@ class MediaCompressor:
         logger.info(f"Prioritized {file_path} with priority {priority}")
         self.db.log_system_event("file_prioritized", f"File {file_path} prioritized with level {priority}", "info")
     
-    def _register_job(self, file_path: str):
-        """Register a new compression job in the active jobs list."""
+    def _register_job(self, file_path: str, file_size: int, estimated_time: Optional[int] = None) -> JobInfo:
+        """
+        Register a new compression job in the active jobs list and return its job info.
+        
+        Args:
+            file_path: Path of the file being compressed
+            file_size: Size of the file in bytes, as already stat'ed by the caller
+            estimated_time: Estimated processing time if the caller already has it;
+                looked up in the database when omitted
+        """
         with self.jobs_lock:
             thread_id = threading.get_ident()
             
-            # Get file info for progress tracking
-            file_size = 0
-            try:
-                file_size = os.path.getsize(file_path)
-            except OSError as e:
-                logger.warning(f"Could not get file size for {file_path}: {e}")
-                
             # Get estimated time
-            estimated_time = 0
-            try:
-                with self._db_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT estimated_time FROM processed_files WHERE file_path = ?", (file_path,))
-                    result = cursor.fetchone()
-                    if result and result[0]:
-                        estimated_time = result[0]
-            except sqlite3.Error as e:
-                logger.warning(f"Database error getting estimated time: {e}")
+            if estimated_time is None:
+                estimated_time = self.db.get_estimated_time(file_path)
             
-            self.active_jobs[thread_id] = {
+            job_info: JobInfo = {
                 "file_path": file_path,
                 "file_name": os.path.basename(file_path),
                 "start_time": time.time(),
@@ -168,35 +184,75 @@ class MediaCompressor:
                 "status": "starting",
                 "estimated_time": estimated_time,
                 "eta": None,
-                "current_stage": "initializing"
+                # Seeded with a zero-progress sample so the first tick yields a rate
+                "progress_history": collections.deque([(time.monotonic(), 0.0)], maxlen=8),
+                "progress_rate": None,
+                "current_stage": "initializing",
+                "db_inprogress_written": False
             }
+            self.active_jobs[thread_id] = job_info
+            return job_info
     
     def _update_job_status(self, status: str, progress: Optional[float] = None, stage: Optional[str] = None, eta: Optional[float] = None):
         """Update the status of the current compression job with ETA calculation."""
         with self.jobs_lock:
-            thread_id = threading.get_ident()
-            if thread_id in self.active_jobs:
-                job = self.active_jobs[thread_id]
-                
-                job["status"] = status
-                if progress is not None:
-                    job["progress"] = progress
-                
-                if stage is not None:
-                    job["current_stage"] = stage
-                
-                if eta is not None:
-                    job["eta"] = eta
-                # Calculate ETA if we have progress and no direct ETA is provided
-                elif progress is not None and progress > 0 and eta is None:
-                    elapsed_time = time.time() - job["start_time"]
-                    if elapsed_time > 0:
-                        total_estimated_time = elapsed_time / (progress / 100)
-                        remaining_time = total_estimated_time - elapsed_time
-                        job["eta"] = remaining_time
+            job = self.active_jobs.get(threading.get_ident())
+        if job is not None:
+            self._update_job_fields(job, status, progress, stage, eta)
     
-    def _unregister_job(self):
-        """Remove a compression job from the active jobs list."""
+    def _update_job_fields(self, job: JobInfo, status: str, progress: Optional[float] = None,
+                           stage: Optional[str] = None, eta: Optional[float] = None):
+        """
+        Update a job's status fields in place with ETA calculation.
+        
+        This is the hot path for HandBrake progress callbacks, so it takes the job
+        handle directly instead of looking it up by thread id under jobs_lock.
+        Single dict-item stores are atomic under the GIL, and readers only ever
+        see a field's old or new value.
+        """
+        job["status"] = status
+        if progress is not None:
+            job["progress"] = progress
+            
+            # Mark the file in progress once encoding actually reports progress,
+            # so files rejected before encoding get a single status write
+            if progress > 0 and not job["db_inprogress_written"]:
+                job["db_inprogress_written"] = True
+                self.db.update_file_status(
+                    job["file_path"],
+                    STATUS_IN_PROGRESS,
+                    processing_started=_iso_timestamp(job["start_time"])
+                )
+        
+        if stage is not None:
+            job["current_stage"] = stage
+        
+        if eta is not None:
+            job["eta"] = eta
+        # Estimate ETA from a smoothed progress rate if no direct ETA is provided
+        elif progress is not None and progress > 0:
+            history = job["progress_history"]
+            last_time, last_progress = history[-1]
+            if progress > last_progress:
+                now = time.monotonic()
+                if now > last_time:
+                    rate = (progress - last_progress) / (now - last_time)
+                    previous_rate = job["progress_rate"]
+                    if previous_rate is not None:
+                        rate = self._ETA_EWMA_ALPHA * rate + (1 - self._ETA_EWMA_ALPHA) * previous_rate
+                    job["progress_rate"] = rate
+                    history.append((now, progress))
+                    job["eta"] = (100 - progress) / rate
+    
+    def _unregister_job(self, status: Optional[str] = None, **fields):
+        """
+        Remove a compression job from the active jobs list.
+        
+        Args:
+            status: Optional final file status; pause/stop statuses are written at once, others
+                are queued with the timing data for _flush_pending_updates
+            **fields: Additional columns to store alongside the final status
+        """
         with self.jobs_lock:
             thread_id = threading.get_ident()
             if thread_id in self.active_jobs:
@@ -205,47 +261,85 @@ class MediaCompressor:
                 file_path = job["file_path"]
                 completion_time = time.time() - job["start_time"]
                 
-                # Update time prediction in database
-                self.db.update_compression_time(file_path, int(completion_time))
+                # Pause/stop statuses are written straight away so resume_compression
+                # sees them; other final statuses wait for the next batch flush
+                update = (file_path, status, int(completion_time), fields)
+                if status in self.IMMEDIATE_STATUSES:
+                    self.db.finalize_file_statuses([update])
+                elif status is not None:
+                    with self._pending_lock:
+                        self._pending_updates.append(update)
+                else:
+                    self.db.update_compression_time(file_path, int(completion_time))
                 
                 # Remove from active jobs
                 del self.active_jobs[thread_id]
     
-    def compress_file(self, file_path: str) -> Dict[str, Any]:
-        """Compress a video file using HandBrakeCLI with NVENC."""
+    def _create_job_executor(self) -> ThreadPoolExecutor:
+        """
+        Create the worker pool for compression jobs.
+        
+        Jobs share active_jobs and the database connections, so they stay on
+        threads; the heavy lifting happens in HandBrakeCLI subprocesses. On a
+        free-threaded interpreter the progress parsing in each worker also runs
+        in parallel instead of contending for the GIL.
+        """
+        max_workers = self.config["max_concurrent_jobs"]
+        gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+        
+        if self.config.get("use_free_threaded", False) and gil_enabled:
+            logger.warning("use_free_threaded is set but the interpreter has the GIL enabled; "
+                           "progress handling of %d workers will share the GIL", max_workers)
+        elif not gil_enabled:
+            logger.debug("Free-threaded interpreter detected, running %d workers without the GIL", max_workers)
+        
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compress")
+    
+    def _flush_pending_updates(self):
+        """Write queued final file statuses to the database in a single transaction."""
+        with self._pending_lock:
+            batch, self._pending_updates = self._pending_updates, []
+        
+        if batch:
+            self.db.finalize_file_statuses(batch)
+    
+    def compress_file(self, file_path: str, file_size: Optional[int] = None,
+                      estimated_time: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compress a video file using HandBrakeCLI with NVENC.
+        
+        Args:
+            file_path: Path to the file to compress
+            file_size: Size in bytes already known from the scan; stats the file when omitted
+            estimated_time: Estimated processing time from the queue row; queried when omitted
+        """
         start_time = time.time()
         
-        try:
-            original_size = os.path.getsize(file_path)
-        except Exception as e:
-            logger.error(f"Cannot access file {file_path}: {str(e)}")
-            return {"status": "error", "error": f"Cannot access file: {str(e)}"}
+        if file_size:
+            original_size = file_size
+        else:
+            try:
+                original_size = os.stat(file_path).st_size
+            except Exception as e:
+                logger.error(f"Cannot access file {file_path}: {str(e)}")
+                return {"status": "error", "error": f"Cannot access file: {str(e)}"}
         
         # Register this job in the active jobs list
-        self._register_job(file_path)
+        job = self._register_job(file_path, original_size, estimated_time)
         
-        # Mark file as in progress in database
-        self.db.update_file_status(
-            file_path, 
-            STATUS_IN_PROGRESS,
-            processing_started=datetime.datetime.now().isoformat()
-        )
+        # Status callback bound to this job's info, used by every stage below
+        status_callback = lambda status, progress=None, stage=None, eta=None: self._update_job_fields(
+            job, status, progress, stage, eta)
         
         try:
             # Verify file integrity
             if self.config["recovery"]["verify_files"] and not self.file_processor.verify_file_integrity(
-                file_path, update_status_callback=self._update_job_status
+                file_path, update_status_callback=status_callback
             ):
                 error_msg = f"Original file integrity check failed for {file_path}"
                 logger.error(error_msg)
                 
-                self.db.update_file_status(
-                    file_path,
-                    STATUS_ERROR,
-                    error_message=error_msg
-                )
-                
-                self._unregister_job()
+                self._unregister_job(STATUS_ERROR, error_message=error_msg)
                 return {"status": "error", "error": error_msg, "original_size": original_size}
             
             # Get content-specific compression settings
@@ -254,9 +348,8 @@ class MediaCompressor:
             # Prepare for compression
             temp_output, settings = self.compression_engine.prepare_compression(file_path, compression_settings)
             
-            # Define status callback, is_paused and is_running functions for the compression engine
-            status_callback = lambda status, progress=None, stage=None, eta=None: self._update_job_status(status, progress, stage, eta)
-            is_paused = lambda: self.paused
+            # Define is_paused and is_running functions for the compression engine
+            is_paused = lambda: not self._resume_event.is_set()
             is_running = lambda: self.running
             
             # Run HandBrake
@@ -269,30 +362,22 @@ class MediaCompressor:
                 # If compression was stopped due to pause/stop
                 if self.paused:
                     logger.info(f"Compression of {file_path} paused")
-                    self.db.update_file_status(file_path, STATUS_PAUSED)
-                    self._unregister_job()
+                    self._unregister_job(STATUS_PAUSED)
                     return {"status": "paused", "original_size": original_size}
                 elif not self.running:
                     logger.info(f"Compression of {file_path} stopped")
-                    self.db.update_file_status(file_path, STATUS_PENDING)
-                    self._unregister_job()
+                    self._unregister_job(STATUS_PENDING)
                     return {"status": "stopped", "original_size": original_size}
                 
                 error_msg = "HandBrake compression failed"
                 logger.error(f"Error compressing {file_path}: {error_msg}")
                 
-                self.db.update_file_status(
-                    file_path,
-                    STATUS_ERROR,
-                    error_message=error_msg
-                )
-                
-                self._unregister_job()
+                self._unregister_job(STATUS_ERROR, error_message=error_msg)
                 return {"status": "error", "error": error_msg, "original_size": original_size}
             
             # Define verify integrity function for finalization
             verify_integrity = lambda file_path: self.file_processor.verify_file_integrity(
-                file_path, update_status_callback=self._update_job_status
+                file_path, update_status_callback=status_callback
             )
             
             # Finalize compression
@@ -310,19 +395,17 @@ class MediaCompressor:
                 checksum = self.file_processor.get_file_checksum(file_path)
                 result["checksum"] = checksum
                 
-                # Record in database
-                self.db.update_file_status(
-                    file_path,
-                    STATUS_COMPLETED,
-                    original_size=original_size,
-                    compressed_size=result["compressed_size"],
-                    compression_date=datetime.datetime.now().isoformat(),
-                    checksum=checksum,
-                    content_type=settings["content_type"],
-                    quality_score=result["quality_score"],
-                    compression_count=1,  # Increment compression count
-                    actual_time=int(duration)
-                )
+                # Record in database (actual_time is written by _unregister_job)
+                final_status = STATUS_COMPLETED
+                final_fields = {
+                    "original_size": original_size,
+                    "compressed_size": result["compressed_size"],
+                    "compression_date": _iso_timestamp(),
+                    "checksum": checksum,
+                    "content_type": settings["content_type"],
+                    "quality_score": result["quality_score"],
+                    "compression_count": 1  # Increment compression count
+                }
                 
                 # Update stats
                 self.stats["files_processed"] += 1
@@ -330,24 +413,25 @@ class MediaCompressor:
                 self.stats["total_compressed_size"] += result["compressed_size"]
                 
                 # Log success
-                logger.info(f"Successfully compressed {file_path}. "
-                            f"Original: {original_size/1024/1024:.2f}MB, "
-                            f"Compressed: {result['compressed_size']/1024/1024:.2f}MB, "
-                            f"Reduction: {result['reduction']:.2%}, "
-                            f"Quality: {result['quality_score']:.2f}, "
-                            f"Time: {duration:.2f}s")
+                logger.info("Successfully compressed %s. Original: %.2fMB, Compressed: %.2fMB, "
+                            "Reduction: %.2f%%, Quality: %.2f, Time: %.2fs",
+                            file_path, original_size / 1048576, result["compressed_size"] / 1048576,
+                            result["reduction"] * 100, result["quality_score"], duration)
             
             elif result["status"] == "skipped":
-                self.db.update_file_status(
-                    file_path,
-                    STATUS_SKIPPED,
-                    skip_reason=result.get("reason", "Unknown reason"),
-                    content_type=settings["content_type"],
-                    quality_score=result.get("quality_score", 0)
-                )
+                final_status = STATUS_SKIPPED
+                final_fields = {
+                    "skip_reason": result.get("reason", "Unknown reason"),
+                    "content_type": settings["content_type"],
+                    "quality_score": result.get("quality_score", 0)
+                }
+            
+            else:
+                final_status = None
+                final_fields = {}
             
-            # Unregister this job from active jobs
-            self._unregister_job()
+            # Unregister this job, storing its final status and timing in one transaction
+            self._unregister_job(final_status, **final_fields)
             
             # Add duration to the result
             result["duration"] = duration
@@ -365,21 +449,11 @@ class MediaCompressor:
             )
             
             # Clean up temp file if it exists
-            if 'temp_output' in locals() and os.path.exists(temp_output):
-                try:
-                    os.remove(temp_output)
-                except OSError:
-                    pass
-            
-            # Update database with error status
-            self.db.update_file_status(
-                file_path,
-                STATUS_ERROR,
-                error_message=error_msg[:1000]  # Limit error message length
-            )
+            if 'temp_output' in locals():
+                self.compression_engine.discard_temp_output(temp_output)
             
-            # Unregister this job from active jobs
-            self._unregister_job()
+            # Update database with error status and unregister this job
+            self._unregister_job(STATUS_ERROR, error_message=error_msg[:1000])  # Limit error message length
             
             return {
                 "status": "error",
@@ -387,9 +461,18 @@ class MediaCompressor:
                 "original_size": original_size
             }
     
+    def _get_db_statistics(self) -> Dict:
+        """Return database statistics, reusing a snapshot up to 2 seconds old."""
+        cached_at, stats = self._db_stats_cache
+        now = time.monotonic()
+        if stats is None or now - cached_at >= 2.0:
+            stats = self.db.get_statistics()
+            self._db_stats_cache = (now, stats)
+        return stats
+    
     def get_estimated_completion_time(self) -> Dict[str, Any]:
         """Get estimated completion time for all pending files."""
-        stats = self.db.get_statistics()
+        stats = self._get_db_statistics()
         
         if not stats["processing_times"]["average_seconds"]:
             return {
@@ -410,7 +493,7 @@ class MediaCompressor:
             total_eta = total_eta / concurrent_jobs
         
         # Format the ETA
-        eta_formatted = self._format_time_remaining(total_eta)
+        eta_formatted = self._format_time(total_eta)
         
         pending_files = stats["status_counts"].get(STATUS_PENDING, 0)
         
@@ -421,24 +504,6 @@ class MediaCompressor:
             "average_time_per_file": avg_time
         }
     
-    def _format_time_remaining(self, seconds: float) -> str:
-        """Format ETA into human-readable string."""
-        if seconds <= 0:
-            return "< 1 minute"
-        elif seconds < 60:
-            return f"{int(seconds)} seconds"
-        elif seconds < 3600:
-            minutes = int(seconds // 60)
-            return f"{minutes} minute{'s' if minutes > 1 else ''}"
-        elif seconds < 86400:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            return f"{hours} hour{'s' if hours > 1 else ''}, {minutes} minute{'s' if minutes > 1 else ''}"
-        else:
-            days = int(seconds // 86400)
-            hours = int((seconds % 86400) // 3600)
-            return f"{days} day{'s' if days > 1 else ''}, {hours} hour{'s' if hours > 1 else ''}"
-    
     def process_compression_queue(self, limit: Optional[int] = None, force_now: bool = False) -> Dict[str, Any]:
         """Process files in the compression queue."""
         if not self.compression_engine.check_dependencies():
@@ -454,6 +519,7 @@ class MediaCompressor:
         self.stats["session_start"] = start_time
         self.paused = False
         self.running = True
+        self._resume_event.set()
         
         # Check system resources
         if not self.resource_monitor.check_system_resources():
@@ -476,14 +542,17 @@ class MediaCompressor:
         files_processed = 0
         errors = 0
         
-        with ThreadPoolExecutor(max_workers=self.config["max_concurrent_jobs"]) as executor:
+        with self._create_job_executor() as executor:
             # Create a map of future to file data
             future_to_file = {}
             
             # Submit compression jobs 
             for file_data in files_to_compress:
                 file_path = file_data["file_path"]
-                future = executor.submit(self.compress_file, file_path)
+                # Reuse the size and estimate already in the queue row instead of
+                # stat-ing the file and querying the database again per job
+                future = executor.submit(self.compress_file, file_path,
+                                         file_data["original_size"], file_data["estimated_time"])
                 future_to_file[future] = file_data
             
             # Process results as they complete
@@ -501,15 +570,19 @@ class MediaCompressor:
                     elif result["status"] == "error":
                         errors += 1
                     
+                    # Write final statuses as soon as a job completes; workers that
+                    # finished together still share one transaction
+                    self._flush_pending_updates()
+                    
                     # Check if we should stop processing
                     if not self.running:
                         logger.info("Compression stopped")
                         break
                         
-                    # Check if we should pause
-                    while self.paused and self.running:
+                    # Block while paused; resume and stop both set the event
+                    if not self._resume_event.is_set():
                         logger.debug("Compression paused, waiting...")
-                        time.sleep(5)
+                        self._resume_event.wait()
                         
                 except Exception as e:
                     logger.error(f"Exception processing {file_path}: {str(e)}")
@@ -522,6 +595,9 @@ class MediaCompressor:
                         error_message=str(e)[:1000]
                     )
         
+        # Write any final statuses still queued once every worker has finished
+        self._flush_pending_updates()
+        
         # Record session statistics if any files were processed
         if files_processed > 0 or errors > 0:
             return self._record_compression_statistics(
@@ -540,6 +616,9 @@ class MediaCompressor:
         else:
             savings_percentage = 0
         
+        # Session totals changed, so the next ETA must see fresh database stats
+        self._db_stats_cache = (0.0, None)
+        
         # Update overall stats
         self.stats["files_processed"] = files_processed
         self.stats["total_original_size"] = total_original_size
@@ -547,27 +626,15 @@ class MediaCompressor:
         self.stats["errors"] = errors
         
         # Record in database
-        try:
-            with self._db_connection() as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                INSERT INTO compression_stats 
-                (start_time, end_time, files_processed, total_original_size, total_compressed_size, savings_percentage, errors)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    datetime.datetime.fromtimestamp(start_time).isoformat(),
-                    datetime.datetime.now().isoformat(),
-                    files_processed,
-                    total_original_size,
-                    total_compressed_size,
-                    savings_percentage,
-                    errors
-                ))
-                
-                conn.commit()
-        except sqlite3.Error as e:
-            logger.error(f"Database error recording stats: {str(e)}")
+        self.db.record_compression_stats(
+            _iso_timestamp(start_time),
+            _iso_timestamp(),
+            files_processed,
+            total_original_size,
+            total_compressed_size,
+            savings_percentage,
+            errors
+        )
         
         # Send completion notification
         self.notification_service.send_completion_notification({
@@ -579,13 +646,14 @@ class MediaCompressor:
         })
         
         # Log completion details
-        logger.info(f"Compression session completed.")
-        logger.info(f"Files processed: {files_processed}")
-        logger.info(f"Errors: {errors}")
-        logger.info(f"Total original size: {total_original_size/1024/1024/1024:.2f}GB")
-        logger.info(f"Total compressed size: {total_compressed_size/1024/1024/1024:.2f}GB")
-        logger.info(f"Space saved: {(total_original_size-total_compressed_size)/1024/1024/1024:.2f}GB ({savings_percentage:.2f}%)")
-        logger.info(f"Total duration: {(time.time() - start_time)/60:.2f} minutes")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Compression session completed.")
+            logger.info(f"Files processed: {files_processed}")
+            logger.info(f"Errors: {errors}")
+            logger.info(f"Total original size: {total_original_size/1024/1024/1024:.2f}GB")
+            logger.info(f"Total compressed size: {total_compressed_size/1024/1024/1024:.2f}GB")
+            logger.info(f"Space saved: {(total_original_size-total_compressed_size)/1024/1024/1024:.2f}GB ({savings_percentage:.2f}%)")
+            logger.info(f"Total duration: {(time.time() - start_time)/60:.2f} minutes")
         
         return {
             "status": "completed",
@@ -602,31 +670,42 @@ class MediaCompressor:
         if self.compression_start_time is None:
             return {"status": "idle", "active_jobs": []}
         
-        duration = time.time() - self.compression_start_time
+        # Serve rapid polls from the cached snapshot
+        cached = self._status_cache
+        if cached is not None and time.monotonic() - self._status_cache_ts < 0.25:
+            return cached
         
-        # Get a copy of active jobs to avoid modification during iteration
+        now = time.time()
+        duration = now - self.compression_start_time
+        
+        # Snapshot the fields we need under the lock, then format outside it
+        # so progress callbacks are not held up by string building
         with self.jobs_lock:
-            active_jobs_list = []
-            for thread_id, job_info in self.active_jobs.items():
-                # Calculate elapsed time for each job
-                job_elapsed = time.time() - job_info["start_time"]
-                
-                # Get just the filename for display
-                filename = job_info.get("file_name", "Unknown")
-                
-                # Format job info for display
-                active_jobs_list.append({
-                    "filename": filename,
-                    "full_path": job_info["file_path"],
-                    "status": job_info["status"],
-                    "stage": job_info["current_stage"],
-                    "progress": job_info["progress"],
-                    "size_mb": job_info["file_size"] / (1024 * 1024) if job_info["file_size"] else 0,
-                    "elapsed_seconds": job_elapsed,
-                    "elapsed_formatted": self._format_time(job_elapsed),
-                    "eta_seconds": job_info["eta"],
-                    "eta_formatted": self._format_time(job_info["eta"]) if job_info["eta"] else "Unknown"
-                })
+            snapshot = [
+                (job_info.get("file_name", "Unknown"), job_info["file_path"], job_info["status"],
+                 job_info["current_stage"], job_info["progress"], job_info["file_size"],
+                 job_info["start_time"], job_info["eta"])
+                for job_info in self.active_jobs.values()
+            ]
+        
+        active_jobs_list = []
+        for filename, file_path, status, stage, progress, file_size, start_time, eta in snapshot:
+            # Calculate elapsed time for each job
+            job_elapsed = now - start_time
+            
+            # Format job info for display
+            active_jobs_list.append({
+                "filename": filename,
+                "full_path": file_path,
+                "status": status,
+                "stage": stage,
+                "progress": progress,
+                "size_mb": file_size / (1024 * 1024) if file_size else 0,
+                "elapsed_seconds": job_elapsed,
+                "elapsed_formatted": self._format_time(job_elapsed),
+                "eta_seconds": eta,
+                "eta_formatted": self._format_time(eta) if eta else "Unknown"
+            })
         
         # Get overall ETA information
         eta_info = self.get_estimated_completion_time()
@@ -638,7 +717,7 @@ class MediaCompressor:
         elif not self.running:
             status = "stopping"
         
-        return {
+        result = {
             "status": status,
             "paused": self.paused,
             "active_jobs": active_jobs_list,
@@ -650,19 +729,15 @@ class MediaCompressor:
             "duration_formatted": self._format_time(duration),
             "eta": eta_info
         }
+        
+        self._status_cache = result
+        self._status_cache_ts = time.monotonic()
+        return result
     
     def _format_time(self, seconds: Optional[float]) -> str:
         """Format time in seconds to a human readable string."""
         if seconds is None:
             return "Unknown"
-            
-        if seconds < 60:
-            return f"{int(seconds)}s"
-        elif seconds < 3600:
-            minutes = int(seconds // 60)
-            sec = int(seconds % 60)
-            return f"{minutes}m {sec}s"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
\ No newline at end of file
+        
+        # Values only change at one-second granularity, so cache per whole second
+        return _format_seconds(int(seconds))
\ No newline at end of file
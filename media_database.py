@@ -1,59 +1,417 @@
 import sqlite3
+import time
+import atexit
 import os
 import shutil
 import datetime
 import logging
+import functools
+import threading
+import queue
 from pathlib import Path
-from typing import Dict, List
-from datetime import time
+from contextlib import closing, contextmanager, suppress
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 from constants import *
 
 logger = logging.getLogger('MediaCompressor.Database')
 
+class FileInfo(NamedTuple):
+    """A discovered media file waiting to be added to processed_files."""
+    file_path: str
+    size: int
+    checksum: str = ""
+    status: str = STATUS_NEW
+    priority: int = 0
+    mtime_ns: Optional[int] = None
+
+# Primary SQLite result codes (sqlite3 exposes them only on Python 3.11+)
+_SQLITE_BUSY = 5
+_SQLITE_LOCKED = 6
+_SQLITE_CORRUPT = 11
+_SQLITE_NOTADB = 26
+
+def _sqlite_error_code(error: sqlite3.Error) -> Optional[int]:
+    """Return the primary SQLite result code of an error, if the interpreter reports it."""
+    code = getattr(error, "sqlite_errorcode", None)
+    return code & 0xFF if code is not None else None
+
+def _is_busy_error(error: sqlite3.Error) -> bool:
+    """Whether an error is transient lock contention that is worth retrying."""
+    code = _sqlite_error_code(error)
+    if code is not None:
+        return code in (_SQLITE_BUSY, _SQLITE_LOCKED)
+    return "database is locked" in str(error).lower()
+
+def _needs_repair(error: sqlite3.Error) -> bool:
+    """Whether an error means the database file is damaged or missing its schema."""
+    code = _sqlite_error_code(error)
+    if code in (_SQLITE_CORRUPT, _SQLITE_NOTADB):
+        return True
+    message = str(error).lower()
+    return "malformed" in message or "not a database" in message or "no such table" in message
+
+# processed_files columns that the update helpers may set by name (file_name and
+# directory_path are generated from file_path and cannot be set)
+UPDATABLE_COLUMNS = frozenset({
+    "original_size", "compressed_size",
+    "first_seen_date", "last_checked_date", "compression_date", "queued_date",
+    "processing_started", "checksum", "content_type", "quality_score", "status",
+    "error_message", "skip_reason", "compression_count", "priority",
+    "estimated_time", "actual_time", "mtime_ns"
+})
+
+@functools.lru_cache(maxsize=64)
+def _update_sql(columns: Tuple[str, ...]) -> str:
+    """
+    Build the UPDATE that sets the given columns of a file by file_path.
+    
+    Column names are interpolated into the SQL, so they are checked against
+    UPDATABLE_COLUMNS. The text is cached per column tuple so every call shape
+    reuses the same string and hits sqlite3's statement cache.
+    
+    Raises:
+        ValueError: If a column is not in UPDATABLE_COLUMNS
+    """
+    unknown = set(columns) - UPDATABLE_COLUMNS
+    if unknown:
+        raise ValueError(f"Cannot update unknown processed_files columns: {', '.join(sorted(unknown))}")
+    
+    assignments = ", ".join(f"{key} = ?" for key in columns)
+    return f"UPDATE processed_files SET {assignments} WHERE file_path = ?"
+
+# Generated columns need SQLite 3.31+; older libraries (common with Python 3.8
+# builds) keep file_name and directory_path as plain columns filled on insert
+_SQLITE_GENERATED_COLUMNS = sqlite3.sqlite_version_info >= (3, 31, 0)
+
+# file_name and directory_path as virtual generated columns: SQLite derives them
+# from file_path when read, so inserts skip them and they take no space in the row.
+# rtrim(p, replace(p, '/', '')) strips the trailing run of non-slash characters,
+# leaving the directory with its final slash.
+if _SQLITE_GENERATED_COLUMNS:
+    _PATH_COLUMNS = """
+    file_name TEXT GENERATED ALWAYS AS
+        (substr(file_path, length(rtrim(file_path, replace(file_path, '/', ''))) + 1)) VIRTUAL,
+    directory_path TEXT GENERATED ALWAYS AS
+        (rtrim(rtrim(file_path, replace(file_path, '/', '')), '/')) VIRTUAL,"""
+else:
+    _PATH_COLUMNS = """
+    file_name TEXT,              -- Just the file name for quicker display
+    directory_path TEXT,         -- Directory for grouping and filtering"""
+
+# Column definitions of processed_files
+_PROCESSED_FILES_COLUMNS = f"""(
+    id INTEGER PRIMARY KEY,
+    file_path TEXT UNIQUE,{_PATH_COLUMNS}
+    original_size INTEGER,
+    compressed_size INTEGER,
+    first_seen_date TIMESTAMP,   -- When the file was first discovered
+    last_checked_date TIMESTAMP, -- Last time file was checked
+    compression_date TIMESTAMP,  -- When compression was completed
+    queued_date TIMESTAMP,       -- When file was queued for compression
+    processing_started TIMESTAMP,-- When compression started
+    checksum TEXT,
+    content_type TEXT,
+    quality_score REAL,
+    status TEXT,                 -- More detailed status tracking
+    error_message TEXT,          -- Store full error messages
+    skip_reason TEXT,            -- Reason for skipping
+    compression_count INTEGER DEFAULT 0, -- Number of times compressed
+    priority INTEGER DEFAULT 0,   -- Priority for compression queue
+    estimated_time INTEGER DEFAULT 0, -- Estimated processing time in seconds
+    actual_time INTEGER DEFAULT 0,    -- Actual processing time in seconds
+    mtime_ns INTEGER                  -- Modification time seen by the last scan
+)"""
+
+# Constant statements for the hot paths. Keeping each one a single module-level string
+# means every call passes the identical text, so sqlite3's per-connection statement
+# cache hands back the already-prepared statement instead of reparsing it.
+_SQL_INSERT_EVENTS = """
+INSERT INTO system_events (timestamp, event_type, details, severity)
+VALUES (?, ?, ?, ?)
+"""
+
+_SQL_GET_FILE_STATUS = (
+    "SELECT id, status, checksum, original_size, compressed_size, priority "
+    "FROM processed_files WHERE file_path = ?"
+)
+
+# Every path strictly inside a directory: '0' is the character after '/', so this
+# is a range scan over the file_path index rather than a LIKE pattern match
+_SQL_PATHS_UNDER = (
+    "SELECT file_path, original_size, checksum, status, mtime_ns "
+    "FROM processed_files WHERE file_path >= ? || '/' AND file_path < ? || '0'"
+)
+
+_SQL_UPSERT_FILES = f"""
+INSERT INTO processed_files 
+(file_path, {"" if _SQLITE_GENERATED_COLUMNS else "file_name, directory_path, "}original_size,
+ first_seen_date, last_checked_date, checksum, status, priority, mtime_ns)
+VALUES ({"" if _SQLITE_GENERATED_COLUMNS else "?, ?, "}?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(file_path) DO UPDATE SET
+    last_checked_date = excluded.last_checked_date,
+    checksum = excluded.checksum,
+    status = excluded.status,
+    mtime_ns = excluded.mtime_ns
+"""
+
+# The status is inlined rather than bound so the planner can match idx_pending_queue
+_SQL_PENDING_QUEUE = f"""
+SELECT file_path, original_size, checksum, priority, estimated_time
+FROM processed_files
+WHERE status = '{STATUS_PENDING}'
+ORDER BY priority DESC, original_size DESC
+LIMIT ?
+"""
+
+_SQL_UPSERT_DIRECTORY = """
+INSERT INTO scanned_directories
+(directory_path, last_scan_date, file_count, total_size, scan_duration, status)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(directory_path) DO UPDATE SET
+    last_scan_date = excluded.last_scan_date,
+    file_count = excluded.file_count,
+    total_size = excluded.total_size,
+    scan_duration = excluded.scan_duration,
+    status = excluded.status
+"""
+
+# UPDATE ... FROM needs SQLite 3.33+; older libraries read the reference size first
+# and run the per-row estimate UPDATE with the resulting time per MB
+_SQLITE_UPDATE_FROM = sqlite3.sqlite_version_info >= (3, 33, 0)
+
+_SQL_REFRESH_ESTIMATES = """
+UPDATE processed_files
+SET estimated_time = ROUND(original_size * (? / MAX(1.0, ref.size / 1048576.0)) / 1048576)
+FROM (SELECT original_size AS size FROM processed_files WHERE file_path = ?) AS ref
+WHERE status = ? AND estimated_time = 0 AND ref.size > 0
+"""
+
+_SQL_GET_ORIGINAL_SIZE = "SELECT original_size FROM processed_files WHERE file_path = ?"
+
+_SQL_SEED_ESTIMATES = """
+UPDATE processed_files
+SET estimated_time = ROUND(original_size * ? / 1048576)
+WHERE status = ? AND estimated_time = 0
+"""
+
+_SQL_SET_ACTUAL_TIME = "UPDATE processed_files SET actual_time = ? WHERE file_path = ?"
+
+_SQL_GET_EST_TIME = "SELECT estimated_time FROM processed_files WHERE file_path = ?"
+
+_SQL_REPLACE_STATUS = "UPDATE processed_files SET status = ? WHERE status = ?"
+
+_SQL_INSERT_STATS = """
+INSERT INTO compression_stats
+    (start_time, end_time, files_processed, total_original_size, total_compressed_size, savings_percentage, errors)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# One pass over processed_files: counts, sizes, times and estimates per status
+_SQL_STATUS_SUMMARY = """
+SELECT 
+    status,
+    COUNT(*) as count,
+    SUM(original_size) as total_original,
+    SUM(compressed_size) as total_compressed,
+    AVG(CASE WHEN actual_time > 0 THEN actual_time END) as avg_time,
+    MIN(CASE WHEN actual_time > 0 THEN actual_time END) as min_time,
+    MAX(CASE WHEN actual_time > 0 THEN actual_time END) as max_time,
+    SUM(estimated_time) as total_estimated_time,
+    100.0 * (SUM(original_size) - SUM(compressed_size)) / NULLIF(SUM(original_size), 0) as savings_percentage
+FROM processed_files 
+GROUP BY status
+"""
+
+# Totals over the last 10 sessions. The LIMIT has to sit in a subquery: applied to
+# the aggregate itself it limits the single result row, not the rows summed
+_SQL_RECENT_SESSIONS = """
+SELECT 
+    SUM(files_processed) as total_files,
+    SUM(total_original_size) as total_original,
+    SUM(total_compressed_size) as total_compressed
+FROM (
+    SELECT files_processed, total_original_size, total_compressed_size
+    FROM compression_stats
+    ORDER BY end_time DESC
+    LIMIT 10
+)
+"""
+
+_SQL_RECENT_EVENTS = """
+SELECT id, timestamp, event_type, details, severity
+FROM system_events
+ORDER BY timestamp DESC
+LIMIT ?
+"""
+
+def _group_updates(file_list: Iterable[Dict]) -> Dict[str, List[Tuple]]:
+    """
+    Group per-file update dicts by their column set, so each distinct UPDATE is
+    prepared once and run with executemany.
+    
+    Each dict holds "file_path" plus the processed_files columns to set. Rows
+    without a status (e.g. last_checked_date refreshes) keep their current one.
+    
+    Returns:
+        Dict mapping UPDATE statement to its parameter rows
+    """
+    groups: Dict[str, List[Tuple]] = {}
+    for file_info in file_list:
+        columns = tuple(sorted(key for key in file_info if key != "file_path"))
+        groups.setdefault(_update_sql(columns), []).append(
+            (*(file_info[key] for key in columns), file_info["file_path"]))
+    return groups
+
 class MediaDatabase:
     """
     Database manager for tracking file processing status.
     Separated from the main compressor class for better organization.
     """
+    # Read-only connections kept for dashboard and queue queries
+    READER_POOL_SIZE = 4
+    
+    # Prepared statements kept per connection (sqlite3 defaults to 128)
+    STATEMENT_CACHE_SIZE = 512
+    
+    # Bump when _ensure_schema_updated gains a migration step
+    SCHEMA_VERSION = 3
+    
+    # Paths bound per "file_path IN (...)" statement, well under SQLite's variable limit
+    IN_CLAUSE_CHUNK = 500
+    
+    # Buffered system events are written once this many are queued...
+    EVENT_FLUSH_SIZE = 32
+    # ...or this many seconds after the first one, whichever comes first
+    EVENT_FLUSH_INTERVAL = 2.0
+    
     def __init__(self, db_path: str, backup_path: str = None):
         self.db_path = db_path
         self.backup_path = backup_path or db_path + ".backup"
         self.last_backup_time = None
+        
+        # Persistent per-thread connections; bumping the generation makes every
+        # thread reopen its connection, e.g. after the database file is replaced
+        self._local = threading.local()
+        self._conn_generation = 0
+        
+        # Pooled read-only connections as (generation, connection) pairs
+        self._readers: queue.Queue = queue.Queue(maxsize=self.READER_POOL_SIZE)
+        
+        # System events waiting to be written in one batch by flush_events()
+        self._event_buffer: List[Tuple[str, str, str, str]] = []
+        self._event_lock = threading.Lock()
+        self._events_queued = threading.Event()  # Set once the buffer is non-empty
+        self._events_full = threading.Event()    # Set once EVENT_FLUSH_SIZE events are buffered
+        
         self._init_database()
+        
+        # One long-lived writer thread flushes the buffer, so its connection is reused
+        self._event_thread = threading.Thread(target=self._event_writer_loop, daemon=True)
+        self._event_thread.start()
+        atexit.register(self.close)
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Return this thread's database connection, opening it on first use.
+        
+        Connections stay open for the life of the thread in autocommit mode, with
+        WAL and the tuned pragmas applied once. Multi-statement writes open an
+        explicit transaction with BEGIN IMMEDIATE.
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None:
+            if local.generation == self._conn_generation:
+                return conn
+            with suppress(sqlite3.Error):
+                conn.close()
+        
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30,
+                               cached_statements=self.STATEMENT_CACHE_SIZE)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")  # Read pages through a 256MB memory map
+        conn.execute("PRAGMA busy_timeout=5000")
+        
+        local.conn = conn
+        local.generation = self._conn_generation
+        return conn
+    
+    def close(self):
+        """
+        Flush buffered events, refresh planner statistics with PRAGMA optimize
+        and close this thread's connection.
+        """
+        self.flush_events()
+        
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            logger.warning(f"PRAGMA optimize failed on close: {str(e)}")
+        self._reset_connections()
+    
+    @contextmanager
+    def _get_reader(self):
+        """
+        Borrow a read-only connection from the reader pool.
+        
+        Readers are opened with mode=ro and query_only, so under WAL they never
+        wait behind the writers. Connections from before a repair are discarded.
+        """
+        conn = None
+        while conn is None:
+            try:
+                generation, conn = self._readers.get_nowait()
+            except queue.Empty:
+                generation, conn = self._conn_generation, self._open_reader()
+            if generation != self._conn_generation:
+                with suppress(sqlite3.Error):
+                    conn.close()
+                conn = None
+        
+        try:
+            yield conn
+        finally:
+            try:
+                self._readers.put_nowait((generation, conn))
+            except queue.Full:
+                conn.close()
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database with the read pragmas applied."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=30,
+                               cached_statements=self.STATEMENT_CACHE_SIZE)
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA cache_size=-16384")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+    
+    def _reset_connections(self):
+        """Close this thread's connection and make all other threads reopen theirs."""
+        self._conn_generation += 1
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            with suppress(sqlite3.Error):
+                conn.close()
+            self._local.conn = None
     
     def _init_database(self):
         """Initialize the SQLite database with enhanced schema for tracking files."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
             # Enhanced processed_files table with more status info
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS processed_files (
-                id INTEGER PRIMARY KEY,
-                file_path TEXT UNIQUE,
-                file_name TEXT,              -- Just the file name for quicker display
-                directory_path TEXT,         -- Directory for grouping and filtering
-                original_size INTEGER,
-                compressed_size INTEGER,
-                first_seen_date TIMESTAMP,   -- When the file was first discovered
-                last_checked_date TIMESTAMP, -- Last time file was checked
-                compression_date TIMESTAMP,  -- When compression was completed
-                queued_date TIMESTAMP,       -- When file was queued for compression
-                processing_started TIMESTAMP,-- When compression started
-                checksum TEXT,
-                content_type TEXT,
-                quality_score REAL,
-                status TEXT,                 -- More detailed status tracking
-                error_message TEXT,          -- Store full error messages
-                skip_reason TEXT,            -- Reason for skipping
-                compression_count INTEGER DEFAULT 0, -- Number of times compressed
-                priority INTEGER DEFAULT 0,   -- Priority for compression queue
-                estimated_time INTEGER DEFAULT 0, -- Estimated processing time in seconds
-                actual_time INTEGER DEFAULT 0     -- Actual processing time in seconds
-            )
-            ''')
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS processed_files {_PROCESSED_FILES_COLUMNS}")
             
             # Session stats table (unchanged)
             cursor.execute('''
@@ -93,34 +451,60 @@ class MediaDatabase:
             )
             ''')
             
-            # Improved indexing for faster lookups
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_file_path ON processed_files (file_path)')
+            # Ensure schema is up to date with current code before indexing
+            # columns that older databases may lack
+            self._ensure_schema_updated()
+            
+            # Improved indexing for faster lookups. file_path is UNIQUE and already
+            # has an automatic index, so drop the duplicate older databases carry
+            cursor.execute('DROP INDEX IF EXISTS idx_file_path')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_status ON processed_files (status)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_directory ON processed_files (directory_path)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_first_seen ON processed_files (first_seen_date)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_priority ON processed_files (priority)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_stats_end_time ON compression_stats (end_time DESC)')
+            # Covers load_paths_under, so a scan's preload reads index pages in path order
+            # without visiting the wide table rows
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scan_lookup
+            ON processed_files (file_path, original_size, checksum, status, mtime_ns)
+            ''')
+            # Partial index in queue order, so fetching the next batch is a range scan with no sort
+            cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_pending_queue
+            ON processed_files (priority DESC, original_size DESC)
+            WHERE status = '{STATUS_PENDING}'
+            ''')
             
-            conn.commit()
-            conn.close()
+            # Gather planner statistics (bounded work) so the status/priority indexes get used
+            cursor.execute("PRAGMA analysis_limit=400")
+            cursor.execute("PRAGMA optimize")
             
             logger.info(f"Database initialized at {self.db_path}")
             
             # Create initial backup
             self.backup_database()
             
-            # Ensure schema is up to date with current code
-            self._ensure_schema_updated()
-            
         except sqlite3.Error as e:
             logger.error(f"Database initialization error: {str(e)}")
-            self.repair_database()
+            if _needs_repair(e):
+                self.repair_database()
 
     def _ensure_schema_updated(self):
-        """Check if database schema is current and update if needed."""
+        """
+        Check if database schema is current and update if needed.
+        
+        The schema version is kept in PRAGMA user_version, so an up-to-date
+        database costs a single integer read instead of table introspection.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= self.SCHEMA_VERSION:
+                return True
+            
             # Get current columns in processed_files table
             cursor.execute("PRAGMA table_info(processed_files)")
             columns = [row[1] for row in cursor.fetchall()]
@@ -129,26 +513,67 @@ class MediaDatabase:
             expected_columns = {
                 "estimated_time": "INTEGER DEFAULT 0",
                 "actual_time": "INTEGER DEFAULT 0",
-                "priority": "INTEGER DEFAULT 0"
+                "priority": "INTEGER DEFAULT 0",
+                "mtime_ns": "INTEGER"
             }
             
-            for col_name, col_type in expected_columns.items():
-                if col_name not in columns:
-                    logger.info(f"Adding missing column {col_name} to processed_files table")
-                    cursor.execute(f"ALTER TABLE processed_files ADD COLUMN {col_name} {col_type}")
+            missing_columns = [name for name in expected_columns if name not in columns]
+            for col_name in missing_columns:
+                logger.info(f"Adding missing column {col_name} to processed_files table")
+                cursor.execute(f"ALTER TABLE processed_files ADD COLUMN {col_name} {expected_columns[col_name]}")
+            
+            # Databases created before file_name/directory_path became generated
+            # columns store them; rebuild the table once to drop the stored copies
+            stored_names = []
+            if _SQLITE_GENERATED_COLUMNS:
+                cursor.execute("PRAGMA table_xinfo(processed_files)")
+                stored_names = [row[1] for row in cursor.fetchall()
+                                if row[1] in ("file_name", "directory_path") and row[6] == 0]
+            if stored_names:
+                self._rebuild_processed_files(cursor)
             
-            conn.commit()
-            conn.close()
+            if missing_columns or stored_names:
+                cursor.execute("PRAGMA optimize")
+            
+            cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
             return True
         except sqlite3.Error as e:
             logger.error(f"Error updating database schema: {str(e)}")
             return False
     
+    def _rebuild_processed_files(self, cursor: sqlite3.Cursor):
+        """
+        Copy processed_files into a table with the current column definitions.
+        
+        Indexes go with the old table; _init_database recreates them afterwards.
+        """
+        logger.info("Rebuilding processed_files with generated file_name/directory_path columns")
+        copied = ", ".join(["id", "file_path", *sorted(UPDATABLE_COLUMNS)])
+        
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("DROP TABLE IF EXISTS processed_files_rebuild")
+            cursor.execute(f"CREATE TABLE processed_files_rebuild {_PROCESSED_FILES_COLUMNS}")
+            cursor.execute(f"INSERT INTO processed_files_rebuild ({copied}) SELECT {copied} FROM processed_files")
+            cursor.execute("DROP TABLE processed_files")
+            cursor.execute("ALTER TABLE processed_files_rebuild RENAME TO processed_files")
+            cursor.execute("COMMIT")
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK")
+            raise
+    
     def backup_database(self):
-        """Create a backup of the database."""
+        """
+        Create a backup of the database.
+        
+        Uses SQLite's online backup API, which copies a consistent snapshot
+        (including WAL content) in batches of pages while other connections
+        keep reading and writing.
+        """
         try:
             if os.path.exists(self.db_path):
-                shutil.copy2(self.db_path, self.backup_path)
+                with closing(sqlite3.connect(self.backup_path)) as backup_conn:
+                    self._get_conn().backup(backup_conn, pages=1024)
                 self.last_backup_time = datetime.datetime.now()
                 logger.info(f"Database backup created at {self.backup_path}")
                 return True
@@ -156,9 +581,38 @@ class MediaDatabase:
             logger.error(f"Failed to backup database: {str(e)}")
         return False
     
+    def _exec_with_retry(self, sql: str, params=(), attempts: int = 5) -> sqlite3.Cursor:
+        """
+        Execute a single statement, retrying with exponential backoff while the database is busy.
+        
+        Args:
+            sql: Statement to execute
+            params: Statement parameters
+            attempts: Maximum number of tries before the busy error is raised
+        """
+        delay = 0.05
+        for attempt in range(attempts):
+            try:
+                return self._get_conn().execute(sql, params)
+            except sqlite3.OperationalError as e:
+                if attempt == attempts - 1 or not _is_busy_error(e):
+                    raise
+                time.sleep(delay)
+                delay *= 2
+    
+    def _move_database_files(self, dest_path: str):
+        """Move the database and its WAL sidecar files aside so a stale WAL is never replayed."""
+        shutil.move(self.db_path, dest_path)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                shutil.move(self.db_path + suffix, dest_path + suffix)
+    
     def repair_database(self):
         """Attempt to repair the database from a backup or by rebuilding."""
         try:
+            # Release our handles on the database before moving its files
+            self._reset_connections()
+            
             # First try to restore from backup
             if os.path.exists(self.backup_path):
                 logger.warning(f"Attempting to restore database from backup {self.backup_path}")
@@ -166,7 +620,7 @@ class MediaDatabase:
                 # Rename corrupt database
                 if os.path.exists(self.db_path):
                     corrupt_path = f"{self.db_path}.corrupt.{int(time.time())}"
-                    shutil.move(self.db_path, corrupt_path)
+                    self._move_database_files(corrupt_path)
                     logger.warning(f"Moved corrupt database to {corrupt_path}")
                 
                 # Restore backup
@@ -191,7 +645,7 @@ class MediaDatabase:
             # Rename corrupt database if it exists
             if os.path.exists(self.db_path):
                 corrupt_path = f"{self.db_path}.corrupt.{int(time.time())}"
-                shutil.move(self.db_path, corrupt_path)
+                self._move_database_files(corrupt_path)
             
             # Initialize a fresh database
             self._init_database()
@@ -209,11 +663,10 @@ class MediaDatabase:
     def check_database_integrity(self):
         """Check the integrity of the SQLite database."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             cursor.execute("PRAGMA integrity_check")
             result = cursor.fetchone()
-            conn.close()
             
             if result[0] != "ok":
                 logger.error(f"Database integrity check failed: {result[0]}")
@@ -225,160 +678,298 @@ class MediaDatabase:
             return False
     
     def log_system_event(self, event_type: str, details: str, severity: str = "info"):
-        """Log a system event to the database."""
+        """
+        Log a system event to the database.
+        
+        Events are buffered and written in batches by the event writer thread, either
+        once EVENT_FLUSH_SIZE events are queued or EVENT_FLUSH_INTERVAL seconds after
+        the first one.
+        """
+        row = (datetime.datetime.now().isoformat(), event_type, details, severity)
+        
+        with self._event_lock:
+            self._event_buffer.append(row)
+            pending = len(self._event_buffer)
+        
+        self._events_queued.set()
+        if pending >= self.EVENT_FLUSH_SIZE:
+            self._events_full.set()
+    
+    def _event_writer_loop(self):
+        """Flush buffered system events for the lifetime of the database object."""
+        while True:
+            self._events_queued.wait()
+            self._events_full.wait(self.EVENT_FLUSH_INTERVAL)
+            
+            # Events logged after the clear are either in this flush or re-set the flag
+            self._events_queued.clear()
+            self._events_full.clear()
+            self.flush_events()
+    
+    def flush_events(self):
+        """Write all buffered system events in a single transaction."""
+        with self._event_lock:
+            rows, self._event_buffer = self._event_buffer, []
+        
+        if not rows:
+            return
+        
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            cursor.execute('''
-            INSERT INTO system_events (timestamp, event_type, details, severity)
-            VALUES (?, ?, ?, ?)
-            ''', (
-                datetime.datetime.now().isoformat(),
-                event_type,
-                details,
-                severity
-            ))
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.executemany(_SQL_INSERT_EVENTS, rows)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        except sqlite3.Error as e:
+            logger.error(f"Failed to log system events: {str(e)}")
+    
+    def load_paths_under(self, directory: str) -> Dict[str, Tuple[int, str, str, Optional[int]]]:
+        """
+        Load every known file below a directory in one query.
+        
+        Args:
+            directory: Directory whose files (at any depth) should be loaded
             
-            conn.commit()
-            conn.close()
+        Returns:
+            Dict mapping file_path to (original_size, checksum, status, mtime_ns)
+        """
+        prefix = directory.rstrip("/")
+        try:
+            with self._get_reader() as conn:
+                cursor = conn.execute(_SQL_PATHS_UNDER, (prefix, prefix))
+                return {row[0]: row[1:] for row in cursor}
         except sqlite3.Error as e:
-            logger.error(f"Failed to log system event: {str(e)}")
+            logger.error(f"Database error in load_paths_under: {str(e)}")
+            return {}
     
     def get_file_status(self, file_path: str) -> Dict:
         """Get the status of a file from the database."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "SELECT id, status, checksum, original_size, compressed_size, priority FROM processed_files WHERE file_path = ?", 
-                (file_path,)
-            )
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result:
-                return {
-                    "id": result[0],
-                    "status": result[1],
-                    "checksum": result[2],
-                    "original_size": result[3],
-                    "compressed_size": result[4],
-                    "priority": result[5],
-                    "in_database": True
-                }
-            else:
-                return {"in_database": False}
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(_SQL_GET_FILE_STATUS, (file_path,))
+                result = cursor.fetchone()
+                
+                if result:
+                    return {
+                        "id": result[0],
+                        "status": result[1],
+                        "checksum": result[2],
+                        "original_size": result[3],
+                        "compressed_size": result[4],
+                        "priority": result[5],
+                        "in_database": True
+                    }
+                else:
+                    return {"in_database": False}
         except sqlite3.Error as e:
             logger.error(f"Database error in get_file_status: {str(e)}")
             return {"in_database": False, "error": str(e)}
     
-    def add_new_file(self, file_info: Dict):
-        """Add a new file to the database with initial status."""
+    def add_new_file(self, file_info: FileInfo):
+        """Add a new file to the database with initial status, or refresh an existing entry."""
+        self.bulk_add_new_files([file_info])
+    
+    def bulk_add_new_files(self, file_infos: Union[FileInfo, Iterable[FileInfo]]):
+        """
+        Add or refresh several files in a single transaction.
+        
+        Args:
+            file_infos: A FileInfo or an iterable of them
+        """
+        if isinstance(file_infos, FileInfo):
+            file_infos = (file_infos,)
+        
+        now = datetime.datetime.now().isoformat()
+        rows = [
+            (file_info.file_path, file_info.size, now, now,
+             file_info.checksum, file_info.status, file_info.priority, file_info.mtime_ns)
+            for file_info in file_infos
+        ]
+        
+        # Without generated columns the path parts are stored alongside file_path
+        if not _SQLITE_GENERATED_COLUMNS:
+            rows = [(row[0], os.path.basename(row[0]), os.path.dirname(row[0]), *row[1:]) for row in rows]
+        
+        if not rows:
+            return
+        
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            now = datetime.datetime.now().isoformat()
-            
-            cursor.execute('''
-            INSERT INTO processed_files 
-            (file_path, file_name, directory_path, original_size, first_seen_date, 
-             last_checked_date, checksum, status, priority)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                file_info["file_path"],
-                os.path.basename(file_info["file_path"]),
-                os.path.dirname(file_info["file_path"]),
-                file_info["size"],
-                now,
-                now,
-                file_info.get("checksum", ""),
-                file_info.get("status", STATUS_NEW),
-                file_info.get("priority", 0)
-            ))
-            
-            conn.commit()
-            conn.close()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.executemany(_SQL_UPSERT_FILES, rows)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
         except sqlite3.Error as e:
-            logger.error(f"Database error in add_new_file: {str(e)}")
-            # If it's a unique constraint error, try to update instead
-            if "UNIQUE constraint failed" in str(e):
-                self.update_file_status(
-                    file_info["file_path"],
-                    file_info.get("status", STATUS_NEW),
-                    last_checked_date=now,
-                    checksum=file_info.get("checksum", "")
-                )
+            logger.error(f"Database error in bulk_add_new_files: {str(e)}")
     
     def update_file_status(self, file_path: str, status: str, **kwargs):
         """Update the status and other fields of a file in the database."""
+        sql = _update_sql(("status", *kwargs))
+        values = (status, *kwargs.values(), file_path)
+        
+        try:
+            self._exec_with_retry(sql, values)
+        except sqlite3.Error as e:
+            logger.error(f"Database error in update_file_status: {str(e)}")
+            if _needs_repair(e) and self.repair_database():
+                # Try operation again after repair, without recursing into another repair
+                with suppress(sqlite3.Error):
+                    self._exec_with_retry(sql, values)
+    
+    def update_files_status_many(self, file_paths: List[str], status: str, **kwargs):
+        """
+        Set the same status and fields on several files in a single transaction.
+        
+        Args:
+            file_paths: Paths of the files to update
+            status: Status to store
+            **kwargs: Additional processed_files columns to update
+        """
+        if not file_paths:
+            return
+        
+        values = [status, *kwargs.values()]
+        sql = _update_sql(("status", *kwargs))
+        
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            # Build the SQL query dynamically based on provided kwargs
-            fields = ["status = ?"]
-            values = [status]
-            
-            for key, value in kwargs.items():
-                fields.append(f"{key} = ?")
-                values.append(value)
-            
-            # Add the file_path to values
-            values.append(file_path)
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.executemany(sql, [(*values, file_path) for file_path in file_paths])
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        except sqlite3.Error as e:
+            logger.error(f"Database error in update_files_status_many: {str(e)}")
+    
+    def replace_status(self, old_status: str, new_status: str) -> Optional[int]:
+        """
+        Move every file in one status to another, e.g. paused files back to pending.
+        
+        Returns:
+            Number of files updated, or None if the update failed
+        """
+        try:
+            cursor = self._get_conn().execute(_SQL_REPLACE_STATUS, (new_status, old_status))
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Database error in replace_status: {str(e)}")
+            return None
+    
+    def mark_pending(self, statuses: Iterable[str], file_list: Iterable[Dict] = ()) -> Optional[int]:
+        """
+        Queue every file in one of the given statuses for compression.
+        
+        Args:
+            statuses: Statuses to promote to STATUS_PENDING
+            file_list: Updates as for bulk_update_statuses, applied first in the
+                same transaction so they commit together with the promotion
             
-            sql = f"UPDATE processed_files SET {', '.join(fields)} WHERE file_path = ?"
-            cursor.execute(sql, values)
+        Returns:
+            Number of files queued, or None if the update failed
+        """
+        statuses = tuple(statuses)
+        placeholders = ", ".join("?" * len(statuses))
+        groups = _group_updates(file_list)
+        
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
             
-            conn.commit()
-            conn.close()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                for sql, rows in groups.items():
+                    cursor.executemany(sql, rows)
+                cursor.execute(
+                    f"UPDATE processed_files SET status = ?, queued_date = ? WHERE status IN ({placeholders})",
+                    (STATUS_PENDING, datetime.datetime.now().isoformat(), *statuses)
+                )
+                queued = cursor.rowcount
+                conn.commit()
+                return queued
+            except sqlite3.Error:
+                conn.rollback()
+                raise
         except sqlite3.Error as e:
-            logger.error(f"Database error in update_file_status: {str(e)}")
-            if "no such table" in str(e).lower() or "database is locked" in str(e).lower():
-                self.repair_database()
-                # Try operation again after repair
-                try:
-                    self.update_file_status(file_path, status, **kwargs)
-                except:
-                    pass
+            logger.error(f"Database error in mark_pending: {str(e)}")
+            return None
     
-    def get_files_for_compression(self, limit: int = 100) -> List[Dict]:
-        """Get a batch of files that are ready for compression, ordered by priority."""
+    def mark_files_checked(self, file_paths: List[str], checked_date: str):
+        """
+        Set the same last_checked_date on many files in a single transaction.
+        
+        Paths are bound IN_CLAUSE_CHUNK at a time into one UPDATE ... IN (...),
+        so the date is bound once per chunk rather than once per file.
+        
+        Args:
+            file_paths: Paths of the files that were checked
+            checked_date: ISO timestamp to store
+        """
+        if not file_paths:
+            return
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # This enables column access by name
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            cursor.execute('''
-            SELECT file_path, original_size, checksum, priority, estimated_time
-            FROM processed_files
-            WHERE status = ?
-            ORDER BY priority DESC, original_size DESC
-            LIMIT ?
-            ''', (STATUS_PENDING, limit))
-            
-            files = [dict(row) for row in cursor.fetchall()]
-            conn.close()
-            
-            return files
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                for start in range(0, len(file_paths), self.IN_CLAUSE_CHUNK):
+                    chunk = file_paths[start:start + self.IN_CLAUSE_CHUNK]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(
+                        f"UPDATE processed_files SET last_checked_date = ? WHERE file_path IN ({placeholders})",
+                        (checked_date, *chunk)
+                    )
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        except sqlite3.Error as e:
+            logger.error(f"Database error in mark_files_checked: {str(e)}")
+    
+    def get_files_for_compression(self, limit: int = 100) -> List[sqlite3.Row]:
+        """
+        Get a batch of files that are ready for compression, ordered by priority.
+        
+        Rows are returned as sqlite3.Row, which supports access by column name.
+        """
+        try:
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row  # This enables column access by name
+                
+                cursor.execute(_SQL_PENDING_QUEUE, (limit,))
+                
+                return cursor.fetchall()
         except sqlite3.Error as e:
             logger.error(f"Database error in get_files_for_compression: {str(e)}")
-            self.repair_database()
+            if _needs_repair(e):
+                self.repair_database()
             return []
     
     def record_directory_scan(self, directory: str, file_count: int, total_size: int, duration: float):
         """Record information about a directory scan."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            cursor.execute('''
-            INSERT OR REPLACE INTO scanned_directories
-            (directory_path, last_scan_date, file_count, total_size, scan_duration, status)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
+            cursor.execute(_SQL_UPSERT_DIRECTORY, (
                 directory,
                 datetime.datetime.now().isoformat(),
                 file_count,
@@ -386,147 +977,173 @@ class MediaDatabase:
                 duration,
                 "completed"
             ))
-            
-            conn.commit()
-            conn.close()
         except sqlite3.Error as e:
             logger.error(f"Database error in record_directory_scan: {str(e)}")
     
+    def _refresh_pending_estimates(self, cursor, file_path: str, actual_time: int):
+        """
+        Seed estimated times of unestimated pending files from one file's actual time per MB.
+        
+        The reference size is read by an uncorrelated subquery, which SQLite evaluates
+        once, so this is a single statement instead of a SELECT plus an UPDATE. SQLite
+        before 3.33 has no UPDATE ... FROM and takes the two-statement path.
+        """
+        if _SQLITE_UPDATE_FROM:
+            cursor.execute(_SQL_REFRESH_ESTIMATES, (actual_time, file_path, STATUS_PENDING))
+            return
+        
+        cursor.execute(_SQL_GET_ORIGINAL_SIZE, (file_path,))
+        result = cursor.fetchone()
+        if result and result[0] and result[0] > 0:
+            time_per_mb = actual_time / max(1.0, result[0] / 1048576.0)
+            cursor.execute(_SQL_SEED_ESTIMATES, (time_per_mb, STATUS_PENDING))
+    
+    def get_estimated_time(self, file_path: str) -> int:
+        """Get a file's estimated compression time in seconds, or 0 if it has none."""
+        try:
+            with self._get_reader() as conn:
+                result = conn.execute(_SQL_GET_EST_TIME, (file_path,)).fetchone()
+                return result[0] if result and result[0] else 0
+        except sqlite3.Error as e:
+            logger.warning(f"Database error getting estimated time: {str(e)}")
+            return 0
+    
     def update_compression_time(self, file_path: str, actual_time: int):
         """Update the actual compression time for a file and adjust estimated times."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
-            # Update actual time for this file
-            cursor.execute('''
-            UPDATE processed_files
-            SET actual_time = ?
-            WHERE file_path = ?
-            ''', (actual_time, file_path))
-            
-            # Get file size for calculating time per MB
-            cursor.execute('SELECT original_size FROM processed_files WHERE file_path = ?', (file_path,))
-            result = cursor.fetchone()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(_SQL_SET_ACTUAL_TIME, (actual_time, file_path))
+                self._refresh_pending_estimates(cursor, file_path, actual_time)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+        except sqlite3.Error as e:
+            logger.error(f"Database error in update_compression_time: {str(e)}")
+    
+    def finalize_file_status(self, file_path: str, status: str, actual_time: int, **kwargs):
+        """
+        Record a file's final status and its compression time in a single transaction.
+        
+        Args:
+            file_path: Path of the processed file
+            status: Final status to store
+            actual_time: Time spent on the file in seconds
+            **kwargs: Additional processed_files columns to update
+        """
+        self.finalize_file_statuses([(file_path, status, actual_time, kwargs)])
+    
+    def finalize_file_statuses(self, updates: List[Tuple[str, str, int, Dict[str, Any]]]):
+        """
+        Record final statuses and compression times for a batch of files in one transaction.
+        
+        Updates sharing the same set of columns are written with a single executemany.
+        
+        Args:
+            updates: (file_path, status, actual_time, extra_columns) tuples
+        """
+        if not updates:
+            return
+        
+        # Group rows by column set so each distinct statement is compiled once
+        groups: Dict[str, List[Tuple]] = {}
+        for file_path, status, actual_time, fields in updates:
+            sql = _update_sql(("status", "actual_time", *fields))
+            groups.setdefault(sql, []).append(
+                (status, actual_time, *fields.values(), file_path))
+        
+        try:
+            conn = self._get_conn()
+            cursor = conn.cursor()
             
-            if result and result[0] > 0:
-                original_size_mb = result[0] / (1024 * 1024)
-                time_per_mb = actual_time / max(1, original_size_mb)
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
                 
-                # Update estimated times for pending files based on this rate
-                cursor.execute('''
-                UPDATE processed_files
-                SET estimated_time = ROUND(original_size * ? / (1024 * 1024))
-                WHERE status = ? AND estimated_time = 0
-                ''', (time_per_mb, STATUS_PENDING))
-            
-            conn.commit()
-            conn.close()
+                for sql, rows in groups.items():
+                    cursor.executemany(sql, rows)
+                
+                # Pending estimates only change while estimated_time is 0, so the
+                # most recent timing is enough to seed them
+                file_path, _, actual_time, _ = updates[-1]
+                self._refresh_pending_estimates(cursor, file_path, actual_time)
+                
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
         except sqlite3.Error as e:
-            logger.error(f"Database error in update_compression_time: {str(e)}")
+            logger.error(f"Database error in finalize_file_statuses: {str(e)}")
+    
+    def record_compression_stats(self, start_time: str, end_time: str, files_processed: int,
+                                 total_original_size: int, total_compressed_size: int,
+                                 savings_percentage: float, errors: int):
+        """Record the totals of one compression session in compression_stats."""
+        try:
+            self._get_conn().execute(_SQL_INSERT_STATS, (
+                start_time, end_time, files_processed, total_original_size,
+                total_compressed_size, savings_percentage, errors
+            ))
+        except sqlite3.Error as e:
+            logger.error(f"Database error recording stats: {str(e)}")
     
     def get_statistics(self) -> Dict:
         """Get various statistics from the database."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get file counts by status
-            cursor.execute('''
-            SELECT status, COUNT(*) as count 
-            FROM processed_files 
-            GROUP BY status
-            ''')
-            status_counts = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            # Calculate total files
-            cursor.execute('SELECT COUNT(*) FROM processed_files')
-            total_files = cursor.fetchone()[0] or 0
-            
-            # Get total sizes
-            cursor.execute('''
-            SELECT 
-                SUM(original_size) as total_original,
-                SUM(compressed_size) as total_compressed
-            FROM processed_files
-            WHERE status = ?
-            ''', (STATUS_COMPLETED,))
-            
-            size_row = cursor.fetchone()
-            total_original = size_row[0] or 0
-            total_compressed = size_row[1] or 0
-            
-            # Get recent compression stats
-            cursor.execute('''
-            SELECT 
-                SUM(files_processed) as total_files,
-                SUM(total_original_size) as total_original,
-                SUM(total_compressed_size) as total_compressed
-            FROM compression_stats
-            ORDER BY end_time DESC
-            LIMIT 10
-            ''')
-            
-            stats_row = cursor.fetchone()
-            recent_files = stats_row[0] or 0
-            recent_original = stats_row[1] or 0
-            recent_compressed = stats_row[2] or 0
-            
-            # Get average processing times
-            cursor.execute('''
-            SELECT 
-                AVG(actual_time) as avg_time,
-                MIN(actual_time) as min_time,
-                MAX(actual_time) as max_time
-            FROM processed_files
-            WHERE status = ? AND actual_time > 0
-            ''', (STATUS_COMPLETED,))
-            
-            time_row = cursor.fetchone()
-            avg_time = time_row[0] or 0
-            min_time = time_row[1] or 0
-            max_time = time_row[2] or 0
-            
-            # Get estimated total remaining time
-            cursor.execute('''
-            SELECT SUM(estimated_time) as total_estimated_time
-            FROM processed_files
-            WHERE status = ?
-            ''', (STATUS_PENDING,))
-            
-            eta_row = cursor.fetchone()
-            total_eta = eta_row[0] or 0
-            
-            conn.close()
-            
-            # Calculate savings
-            if total_original > 0:
-                savings_percentage = ((total_original - total_compressed) / total_original) * 100
-            else:
-                savings_percentage = 0
-            
-            return {
-                "status_counts": status_counts,
-                "total_files": total_files,  # Explicitly include total files count
-                "total_original_size": total_original,
-                "total_compressed_size": total_compressed,
-                "space_saved": total_original - total_compressed,
-                "savings_percentage": savings_percentage,
-                "recent_compression": {
-                    "files": recent_files,
-                    "original_size": recent_original,
-                    "compressed_size": recent_compressed
-                },
-                "processing_times": {
-                    "average_seconds": avg_time,
-                    "min_seconds": min_time,
-                    "max_seconds": max_time
-                },
-                "estimated_remaining_time": total_eta
-            }
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(_SQL_STATUS_SUMMARY)
+                
+                by_status = {row[0]: row for row in cursor.fetchall()}
+                status_counts = {status: row[1] for status, row in by_status.items()}
+                total_files = sum(status_counts.values())
+                
+                no_rows = (None,) * 9
+                completed_row = by_status.get(STATUS_COMPLETED, no_rows)
+                total_original = completed_row[2] or 0
+                total_compressed = completed_row[3] or 0
+                avg_time = completed_row[4] or 0
+                min_time = completed_row[5] or 0
+                max_time = completed_row[6] or 0
+                savings_percentage = completed_row[8] or 0
+                
+                total_eta = by_status.get(STATUS_PENDING, no_rows)[7] or 0
+                
+                # Get recent compression stats
+                cursor.execute(_SQL_RECENT_SESSIONS)
+                
+                stats_row = cursor.fetchone()
+                recent_files = stats_row[0] or 0
+                recent_original = stats_row[1] or 0
+                recent_compressed = stats_row[2] or 0
+                
+                return {
+                    "status_counts": status_counts,
+                    "total_files": total_files,  # Explicitly include total files count
+                    "total_original_size": total_original,
+                    "total_compressed_size": total_compressed,
+                    "space_saved": total_original - total_compressed,
+                    "savings_percentage": savings_percentage,
+                    "recent_compression": {
+                        "files": recent_files,
+                        "original_size": recent_original,
+                        "compressed_size": recent_compressed
+                    },
+                    "processing_times": {
+                        "average_seconds": avg_time,
+                        "min_seconds": min_time,
+                        "max_seconds": max_time
+                    },
+                    "estimated_remaining_time": total_eta
+                }
         except sqlite3.Error as e:
             logger.error(f"Database error in get_statistics: {str(e)}")
-            self.repair_database()
+            if _needs_repair(e):
+                self.repair_database()
             return {
                 "status_counts": {},
                 "total_files": 0,
@@ -550,38 +1167,17 @@ class MediaDatabase:
     
     def bulk_update_statuses(self, file_list: List[Dict]):
         """Update multiple file statuses in a single transaction for efficiency."""
+        groups = _group_updates(file_list)
+        
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
             try:
-                cursor.execute("BEGIN TRANSACTION")
+                cursor.execute("BEGIN IMMEDIATE")
                 
-                for file_info in file_list:
-                    file_path = file_info["file_path"]
-                    status = file_info["status"]
-                    
-                    # Extract additional fields if present
-                    additional_fields = {}
-                    for key, value in file_info.items():
-                        if key not in ["file_path", "status"]:
-                            additional_fields[key] = value
-                    
-                    # Build the SQL dynamically
-                    fields = ["status = ?"]
-                    values = [status]
-                    
-                    for key, value in additional_fields.items():
-                        fields.append(f"{key} = ?")
-                        values.append(value)
-                    
-                    # Add file_path
-                    values.append(file_path)
-                    
-                    cursor.execute(
-                        f"UPDATE processed_files SET {', '.join(fields)} WHERE file_path = ?",
-                        values
-                    )
+                for sql, rows in groups.items():
+                    cursor.executemany(sql, rows)
                 
                 conn.commit()
                 logger.debug(f"Bulk updated {len(file_list)} files")
@@ -590,30 +1186,26 @@ class MediaDatabase:
                 conn.rollback()
                 logger.error(f"Error in bulk update: {str(e)}")
                 
-            finally:
-                conn.close()
         except sqlite3.Error as e:
             logger.error(f"Database error in bulk_update_statuses: {str(e)}")
-            self.repair_database()
+            if _needs_repair(e):
+                self.repair_database()
     
     def get_recent_events(self, limit: int = 100) -> List[Dict]:
         """Get recent system events from the database."""
+        # Include events still waiting in the buffer
+        self.flush_events()
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            SELECT id, timestamp, event_type, details, severity
-            FROM system_events
-            ORDER BY timestamp DESC
-            LIMIT ?
-            ''', (limit,))
-            
-            events = [dict(row) for row in cursor.fetchall()]
-            conn.close()
-            
-            return events
+            with self._get_reader() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                
+                cursor.execute(_SQL_RECENT_EVENTS, (limit,))
+                
+                events = [dict(row) for row in cursor.fetchall()]
+                
+                return events
         except sqlite3.Error as e:
             logger.error(f"Database error in get_recent_events: {str(e)}")
             return []
\ No newline at end of file
@@ -1,15 +1,13 @@
 import os
 import time
-import hashlib
 import asyncio
 import logging
 import datetime
-import sqlite3
-import queue
-from typing import Dict
-from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-from media_database import MediaDatabase
+from media_database import MediaDatabase, FileInfo
+from file_processor import compute_file_checksum, checksum_algorithm, DEFAULT_CHECKSUM_ALGORITHM
 from constants import *
 
 logger = logging.getLogger('MediaCompressor.Scanner')
@@ -19,10 +17,14 @@ class MediaScanner:
     Media Scanner class that asynchronously scans directories and compares
     files to the database, tracking new and changed files.
     """
+    # Files whose checksums are computed together, with their reads in flight at once
+    HASH_BATCH_SIZE = 32
+    # Checksum threads shared by all directory scans (reads queued to the disk at a time)
+    HASH_WORKERS = 8
+    
     def __init__(self, config: Dict, db: MediaDatabase):
         self.config = config
         self.db = db
-        self.scan_queue = queue.Queue()
         self.files_scanned = 0
         self.new_files_found = 0
         self.changed_files_found = 0
@@ -34,191 +36,269 @@ class MediaScanner:
         self.total_dirs = 0
         self.processed_dirs = 0
         self.stop_requested = False  # Flag to handle interruptions
+        
+        # File filters, precomputed once instead of per directory entry
+        self._ext_tuple = tuple(ext.lower() for ext in config["extensions"])
+        self._min_size_bytes = config["min_size_mb"] * 1024 * 1024
+        
+        self._hash_pool = ThreadPoolExecutor(max_workers=self.HASH_WORKERS, thread_name_prefix="checksum")
     
-    def _get_file_checksum(self, file_path: str) -> str:
-        """Calculate a fast file checksum by hashing parts of the file."""
+    def _get_file_checksum(self, file_path: str, algorithm: Optional[str] = None) -> str:
+        """
+        Calculate a fast file checksum by hashing parts of the file.
+        
+        Args:
+            file_path: Path to the file
+            algorithm: Checksum algorithm; pass checksum_algorithm(stored) when the
+                result will be compared with a checksum already in the database
+        """
         try:
-            file_size = os.path.getsize(file_path)
-            
-            # For small files, hash the entire file
-            if file_size < 8 * 1024 * 1024:  # Less than 8MB
-                with open(file_path, 'rb') as f:
-                    return hashlib.md5(f.read()).hexdigest()
-            
-            # For larger files, hash the first and last 4MB for speed
-            md5 = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                # Read first 4MB
-                data = f.read(4 * 1024 * 1024)
-                md5.update(data)
-                
-                # Seek to last 4MB
-                f.seek(-4 * 1024 * 1024, os.SEEK_END)
-                data = f.read(4 * 1024 * 1024)
-                md5.update(data)
-            
-            return md5.hexdigest()
+            return compute_file_checksum(file_path, algorithm)
         except (IOError, OSError) as e:
             logger.error(f"Error calculating checksum for {file_path}: {str(e)}")
             return ""
     
-    def should_process_file(self, file_path: str) -> bool:
-        """Quick check if a file should be processed (valid extension and size)."""
+    def _hash_many(self, files: List[Tuple[str, Optional[str]]]) -> List[str]:
+        """
+        Checksum several files concurrently so their reads are in flight together.
+        
+        Args:
+            files: (file_path, algorithm) pairs, as for _get_file_checksum
+        """
+        return list(self._hash_pool.map(lambda item: self._get_file_checksum(*item), files))
+    
+    def _resolve_checksums(self, candidates: List[Tuple[str, int, int, Optional[Tuple]]],
+                           new_files: List[FileInfo], files_to_update: List[Dict], checked_date: str):
+        """
+        Hash a batch of new or stat-changed files and record what changed.
+        
+        Args:
+            candidates: (file_path, file_size, mtime_ns, known) tuples, where known is
+                the file's load_paths_under row or None for a new file
+            new_files: New files are appended here as FileInfo
+            files_to_update: Update dicts for bulk_update_statuses are appended here
+            checked_date: ISO timestamp stored as last_checked_date
+        """
+        # Hash known files with the stored checksum's algorithm so legacy MD5 values compare correctly
+        algorithms = [checksum_algorithm(known[1]) if known is not None else None
+                      for _, _, _, known in candidates]
+        checksums = self._hash_many([(candidate[0], algorithm)
+                                     for candidate, algorithm in zip(candidates, algorithms)])
+        
+        for (file_path, file_size, mtime_ns, known), algorithm, checksum in zip(candidates, algorithms, checksums):
+            if known is None:
+                # New file, add to database
+                new_files.append(FileInfo(file_path, file_size, checksum, STATUS_PENDING, mtime_ns=mtime_ns))
+                self.new_files_found += 1
+                
+                if self.new_files_found % 100 == 0:
+                    logger.info(f"Found {self.new_files_found} new files so far")
+            
+            # File changed, update status for reprocessing
+            elif checksum != known[1]:
+                # The stored checksum is replaced anyway, so move legacy MD5 values to the default algorithm
+                if algorithm != DEFAULT_CHECKSUM_ALGORITHM:
+                    checksum = self._get_file_checksum(file_path)
+                
+                files_to_update.append({
+                    "file_path": file_path,
+                    "status": STATUS_NEEDS_REPROCESSING,
+                    "last_checked_date": checked_date,
+                    "checksum": checksum,
+                    "original_size": file_size,
+                    "mtime_ns": mtime_ns
+                })
+                self.changed_files_found += 1
+            
+            # Touched but identical: record the new mtime so it is not hashed again.
+            # original_size is left alone, it must keep the pre-compression size
+            else:
+                files_to_update.append({
+                    "file_path": file_path,
+                    "last_checked_date": checked_date,
+                    "mtime_ns": mtime_ns
+                })
+    
+    def _accept(self, entry: os.DirEntry) -> bool:
+        """Quick check if a directory entry should be processed (valid extension and size)."""
         # Check extension
-        if not any(file_path.lower().endswith(ext) for ext in self.config["extensions"]):
+        if not entry.name.lower().endswith(self._ext_tuple):
             return False
         
         # Check min size
         try:
-            file_size = os.path.getsize(file_path)
-            if file_size < self.config["min_size_mb"] * 1024 * 1024:
-                return False
-            
-            return True
-        except (FileNotFoundError, PermissionError) as e:
-            logger.debug(f"Error checking file {file_path}: {str(e)}")
+            return entry.stat().st_size >= self._min_size_bytes
+        except OSError as e:
+            logger.debug(f"Error checking file {entry.path}: {str(e)}")
             return False
     
+    def _list_directory(self, path: str) -> Tuple[List[str], List[os.DirEntry]]:
+        """
+        List one directory with os.scandir.
+        
+        Like os.walk, an unreadable directory yields nothing and symlinked
+        directories are not followed.
+        
+        Returns:
+            (subdirectory paths, accepted media file entries)
+        """
+        subdirs, media_entries = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if is_dir:
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif self._accept(entry):
+                        media_entries.append(entry)
+        except OSError as e:
+            logger.debug(f"Error listing directory {path}: {str(e)}")
+        return subdirs, media_entries
+    
+    def _iter_media(self, directory: str) -> Iterator[os.DirEntry]:
+        """
+        Yield the media files below a directory as their directories are listed.
+        
+        Sibling directories are listed concurrently on a small thread pool, so
+        getdents/stat latency overlaps instead of adding up; each listing's
+        subdirectories are queued as soon as it completes. DirEntry objects carry
+        cached stat() results. Also advances the directory progress counters.
+        
+        Args:
+            directory: Root directory to scan
+        """
+        with ThreadPoolExecutor(max_workers=self.config["max_concurrent_scans"],
+                                thread_name_prefix="walk") as pool:
+            pending = {pool.submit(self._list_directory, directory)}
+            while pending:
+                if self.stop_requested:
+                    for future in pending:
+                        future.cancel()
+                    logger.info(f"Scan interrupted for directory: {directory}")
+                    return
+                
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, media_entries = future.result()
+                    self.total_dirs += len(subdirs)
+                    pending.update(pool.submit(self._list_directory, path) for path in subdirs)
+                    
+                    yield from media_entries
+                    
+                    # Progress is directories done over directories discovered so far
+                    self.processed_dirs += 1
+                    self.scan_progress = min(99, self.processed_dirs / max(self.total_dirs, self.processed_dirs + 1) * 100)
+    
     async def scan_directory_async(self, directory: str):
         """
         Asynchronously scan a directory and its subdirectories for media files.
+        
+        The scan itself is blocking directory listing, hashing and database work,
+        so it runs in a worker thread; asyncio only bounds how many run at once.
+        
+        Returns:
+            The directory's last batch of file updates, left for the caller to commit
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self._scan_directory, directory)
+    
+    def _scan_directory(self, directory: str) -> List[Dict]:
+        """
+        Scan a directory and its subdirectories for media files, comparing them to the database.
+        
+        Returns:
+            Update dicts (as for bulk_update_statuses) not yet written; empty if interrupted
         """
         self.current_directory = directory
         start_time = time.time()
         files_to_update = []
+        new_files = []
+        unchanged_paths = []
+        to_hash = []
         file_count = 0
+        # One timestamp for every file checked in this directory scan
+        now_iso = datetime.datetime.now().isoformat()
         total_size = 0
         
         logger.info(f"Starting scan of directory: {directory}")
         
         try:
-            # Get total file count first for better progress tracking
-            total_files_estimate = 0
-            for root, dirs, files in os.walk(directory, topdown=True):
-                # Check if stop requested
-                if self.stop_requested:
-                    logger.info(f"Scan interrupted for directory: {directory}")
-                    return
-                    
-                for file_name in files:
-                    if any(file_name.lower().endswith(ext) for ext in self.config["extensions"]):
-                        total_files_estimate += 1
-                        
-                        # For large directories, sample only a portion to estimate
-                        if total_files_estimate > 1000:
-                            break
-                
-                # Break after sampling enough directories
-                if total_files_estimate > 1000:
-                    # Extrapolate based on remaining directories
-                    remaining_dirs_estimate = sum(1 for _ in os.walk(directory))
-                    avg_files_per_dir = total_files_estimate / max(1, len(list(os.walk(directory, topdown=True))))
-                    total_files_estimate = int(avg_files_per_dir * remaining_dirs_estimate)
-                    break
+            # Everything the database knows about this tree, so the scan below
+            # compares against a dict instead of querying once per file
+            known_files = self.db.load_paths_under(directory)
+            
+            # Locals for the per-file loop, which on incremental scans is mostly dict and stat work
+            lookup_known = known_files.get
+            resolve_checksums = self._resolve_checksums
+            hash_batch_size = self.HASH_BATCH_SIZE
+            write_batch_size = self.config["scan_batch_size"]
+            recheck_statuses = (STATUS_ERROR, STATUS_COMPLETED)
             
-            # Now do the actual scan with better progress tracking
-            for root, dirs, files in os.walk(directory):
-                # Check if stop requested
+            for entry in self._iter_media(directory):
+                # Check if stop requested before processing each file
                 if self.stop_requested:
-                    logger.info(f"Scan interrupted while processing directory: {root}")
-                    return
-                    
-                for file_name in files:
-                    # Check if stop requested before processing each file
-                    if self.stop_requested:
-                        return
-                        
-                    file_path = os.path.join(root, file_name)
-                    
-                    # Quick check for valid files
-                    if not self.should_process_file(file_path):
-                        continue
-                    
-                    # Track stats
-                    file_count += 1
-                    try:
-                        file_size = os.path.getsize(file_path)
-                        total_size += file_size
-                        self.files_scanned += 1
-                        
-                        # Update progress based on better total estimate
-                        if total_files_estimate > 0:
-                            self.scan_progress = min(99, (self.files_scanned / total_files_estimate) * 100)
+                    return []
+                
+                file_path = entry.path
+                
+                # Track stats; DirEntry caches the stat() already made by _accept
+                file_count += 1
+                try:
+                    file_stat = entry.stat()
+                    file_size = file_stat.st_size
+                    mtime_ns = file_stat.st_mtime_ns
+                    total_size += file_size
+                    self.files_scanned += 1
+                except OSError as e:
+                    logger.debug(f"Error getting size for {file_path}: {str(e)}")
+                    continue
+                
+                # Check if file is in the database
+                known = lookup_known(file_path)
+                
+                # New files, and known files whose modification time changed, need a
+                # checksum. A compressed file's size differs from original_size, so size
+                # is only compared for rows from before mtime_ns was tracked
+                if known is None or (file_size != known[0] if known[3] is None else known[3] != mtime_ns):
+                    to_hash.append((file_path, file_size, mtime_ns, known))
+                    if len(to_hash) >= hash_batch_size:
+                        resolve_checksums(to_hash, new_files, files_to_update, now_iso)
+                        to_hash = []
                         
-                    except OSError as e:
-                        logger.debug(f"Error getting size for {file_path}: {str(e)}")
-                        continue
-                    
-                    # Check if file is in the database
-                    db_info = self.db.get_file_status(file_path)
+                        # Perform batch writes periodically
+                        if len(new_files) >= write_batch_size:
+                            self.db.bulk_add_new_files(new_files)
+                            new_files = []
+                        if len(files_to_update) >= write_batch_size:
+                            self.db.bulk_update_statuses(files_to_update)
+                            files_to_update = []
+                
+                # File hasn't changed, just update last_checked_date
+                else:
+                    stored_status, stored_mtime_ns = known[2], known[3]
                     
-                    if not db_info["in_database"]:
-                        # New file, calculate checksum and add to database
-                        checksum = self._get_file_checksum(file_path)
-                        
-                        file_info = {
+                    # Backfill mtime_ns for rows recorded before it was tracked
+                    if stored_mtime_ns is None:
+                        files_to_update.append({
                             "file_path": file_path,
-                            "size": file_size,
-                            "checksum": checksum,
-                            "status": STATUS_PENDING
-                        }
-                        
-                        self.db.add_new_file(file_info)
-                        self.new_files_found += 1
-                        
-                        if self.new_files_found % 100 == 0:
-                            logger.info(f"Found {self.new_files_found} new files so far")
+                            "last_checked_date": now_iso,
+                            "mtime_ns": mtime_ns
+                        })
                     
-                    else:
-                        # Existing file, check if changed
-                        stored_checksum = db_info["checksum"]
-                        
-                        # Only calculate new checksum if the file size changed
-                        # This is a significant performance optimization
-                        if file_size != db_info["original_size"]:
-                            checksum = self._get_file_checksum(file_path)
-                            
-                            # File changed, update status for reprocessing
-                            if checksum != stored_checksum:
-                                update_info = {
-                                    "file_path": file_path,
-                                    "status": STATUS_NEEDS_REPROCESSING,
-                                    "last_checked_date": datetime.datetime.now().isoformat(),
-                                    "checksum": checksum,
-                                    "original_size": file_size
-                                }
-                                
-                                files_to_update.append(update_info)
-                                self.changed_files_found += 1
-                                
-                                # Perform batch updates periodically
-                                if len(files_to_update) >= self.config["scan_batch_size"]:
-                                    self.db.bulk_update_statuses(files_to_update)
-                                    files_to_update = []
-                        
-                        # File hasn't changed, just update last_checked_date
-                        else:
-                            update_info = {
-                                "file_path": file_path,
-                                "last_checked_date": datetime.datetime.now().isoformat()
-                            }
-                            
-                            # Only update if status allows for recompression
-                            if db_info["status"] in [STATUS_ERROR, STATUS_COMPLETED]:
-                                files_to_update.append(update_info)
-                    
-                    # Yield control periodically to allow other tasks to run
-                    if file_count % 100 == 0:
-                        await asyncio.sleep(0)
-                
-                # Update progress
-                self.processed_dirs += 1
-                if self.total_dirs > 0:
-                    self.scan_progress = (self.processed_dirs / self.total_dirs) * 100
+                    # Only update if status allows for recompression; these all get
+                    # the same date, so they are written together once the walk ends
+                    elif stored_status in recheck_statuses:
+                        unchanged_paths.append(file_path)
+            
+            if to_hash and not self.stop_requested:
+                self._resolve_checksums(to_hash, new_files, files_to_update, now_iso)
             
-            # Final batch update if not interrupted
-            if files_to_update and not self.stop_requested:
-                self.db.bulk_update_statuses(files_to_update)
+            if unchanged_paths and not self.stop_requested:
+                self.db.mark_files_checked(unchanged_paths, now_iso)
             
             # Record directory scan stats if not interrupted
             if not self.stop_requested:
@@ -226,13 +306,21 @@ class MediaScanner:
                 self.db.record_directory_scan(directory, file_count, total_size, duration)
                 
                 logger.info(f"Completed scan of {directory}: found {file_count} files, {self.new_files_found} new, {self.changed_files_found} changed")
+                
+                # The final batch is committed with the scan's mark_pending, not on its own
+                return files_to_update
             
         except Exception as e:
             logger.error(f"Error scanning directory {directory}: {str(e)}")
             self.db.log_system_event("scan_error", f"Error scanning directory {directory}: {str(e)}", "error")
         
         finally:
+            # New files are kept even if the scan was interrupted; their checksums are already paid for
+            if new_files:
+                self.db.bulk_add_new_files(new_files)
             self.current_directory = None
+        
+        return []
     
     async def scan_all_directories_async(self):
         """
@@ -246,23 +334,14 @@ class MediaScanner:
         self.scan_progress = 0
         self.processed_dirs = 0
         
-        # Queue all directories for scanning
-        self.total_dirs = 0
+        # Collect all directories to scan; subdirectories are counted as the scan finds them
+        valid_paths = []
         for path in self.config["media_paths"]:
-            if os.path.exists(path) and os.path.isdir(path):
-                self.scan_queue.put(path)
-                self.total_dirs += 1
-                
-                # Also count subdirectories to estimate progress better
-                try:
-                    # Sample subdirectory count for large libraries
-                    if os.path.getsize(path) > 1_000_000_000:  # >1GB
-                        subdirs = sum(1 for _ in os.walk(path, topdown=True, onerror=lambda e: None))
-                        self.total_dirs += subdirs
-                except Exception:
-                    pass
+            if os.path.isdir(path):
+                valid_paths.append(path)
             else:
                 logger.warning(f"Media path does not exist or is not a directory: {path}")
+        self.total_dirs = len(valid_paths)
         
         if self.total_dirs == 0:
             logger.warning("No valid directories to scan")
@@ -276,32 +355,20 @@ class MediaScanner:
                 "message": "No valid directories to scan"
             }
         
-        # Process the queue with limited concurrency
-        tasks = []
+        # Scan every directory with limited concurrency
         semaphore = asyncio.Semaphore(self.config["max_concurrent_scans"])
         
-        async def worker():
-            while not self.scan_queue.empty():
-                try:
-                    directory = self.scan_queue.get_nowait()
-                    
-                    async with semaphore:
-                        await self.scan_directory_async(directory)
-                    
-                    self.scan_queue.task_done()
-                except queue.Empty:
-                    break
-                except Exception as e:
-                    logger.error(f"Error in scan worker: {str(e)}")
-                    self.db.log_system_event("scan_worker_error", f"Error in scan worker: {str(e)}", "error")
-        
-        # Start worker tasks
-        for _ in range(min(self.config["max_concurrent_scans"], self.scan_queue.qsize())):
-            task = asyncio.create_task(worker())
-            tasks.append(task)
+        async def bounded_scan(directory: str) -> List[Dict]:
+            try:
+                async with semaphore:
+                    return await self.scan_directory_async(directory)
+            except Exception as e:
+                logger.error(f"Error in scan worker: {str(e)}")
+                self.db.log_system_event("scan_worker_error", f"Error in scan worker: {str(e)}", "error")
+                return []
         
         # Wait for all scanning tasks to complete
-        await asyncio.gather(*tasks)
+        final_batches = await asyncio.gather(*(bounded_scan(path) for path in valid_paths))
         
         # Log summary
         duration = time.time() - self.scan_start_time
@@ -310,30 +377,14 @@ class MediaScanner:
         logger.info(f"New files: {self.new_files_found}")
         logger.info(f"Changed files: {self.changed_files_found}")
         
-        # Mark new and changed files as ready for compression
-        try:
-            conn = sqlite3.connect(self.config["database_path"])
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            UPDATE processed_files 
-            SET status = ?, queued_date = ?
-            WHERE status IN (?, ?)
-            ''', (
-                STATUS_PENDING, 
-                datetime.datetime.now().isoformat(),
-                STATUS_NEW, 
-                STATUS_NEEDS_REPROCESSING
-            ))
-            
-            affected_rows = cursor.rowcount
-            conn.commit()
-            conn.close()
-            
+        # Mark new and changed files as ready for compression, in the same transaction
+        # as each directory's last batch of updates
+        final_updates = [update for batch in final_batches for update in batch]
+        affected_rows = self.db.mark_pending((STATUS_NEW, STATUS_NEEDS_REPROCESSING), final_updates)
+        if affected_rows is not None:
             logger.info(f"Marked {affected_rows} files as pending for compression")
-        except sqlite3.Error as e:
-            logger.error(f"Database error marking files for compression: {str(e)}")
-            self.db.log_system_event("db_update_error", f"Error marking files for compression: {str(e)}", "error")
+        else:
+            self.db.log_system_event("db_update_error", "Error marking files for compression", "error")
         
         # Mark scanning as completed
         self.is_scanning = False
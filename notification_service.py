@@ -2,8 +2,10 @@ import smtplib
 import datetime
 import logging
 import os
+import time
 import shutil
 import requests
+from requests.adapters import HTTPAdapter
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, Any, Optional
@@ -13,10 +15,40 @@ logger = logging.getLogger('MediaCompressor.NotificationService')
 class NotificationService:
     """Service for sending notifications about compression status."""
     
+    # Seconds to wait for a webhook endpoint (connect and read) before giving up
+    WEBHOOK_TIMEOUT = 5
+    
+    # Seconds a temp directory free-space reading is reused
+    DISK_USAGE_TTL = 60
+    
     def __init__(self, config: Dict[str, Any], db_logger=None):
         """Initialize the notification service with configuration."""
         self.config = config
         self.db_logger = db_logger  # For database event logging
+        self._disk_usage_cache = (0.0, None)  # (monotonic timestamp, free GB)
+        self._hostname = os.uname().nodename  # Fixed for the life of the process
+        
+        # Persistent HTTP session so webhook bursts reuse pooled connections
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+        self.refresh_notification_flags()
+    
+    def refresh_notification_flags(self):
+        """Precompute which channels fire for each notification level."""
+        email = self.config["notifications"]["email"]
+        webhook = self.config["notifications"]["webhook"]
+        self._notify_flags = {
+            "error": {
+                "email": bool(email["enabled"] and email["on_error"]),
+                "webhook": bool(webhook["enabled"] and webhook["on_error"])
+            },
+            "info": {
+                "email": bool(email["enabled"] and email["on_completion"]),
+                "webhook": bool(webhook["enabled"] and webhook["on_completion"])
+            }
+        }
     
     def send_notification(self, message: str, level: str = "info"):
         """
@@ -26,19 +58,17 @@ class NotificationService:
             message: The notification message
             level: The notification level ("info", "warning", "error")
         """
+        flags = self._notify_flags.get(level, {})
+        
         # Email notifications
-        if (self.config["notifications"]["email"]["enabled"] and 
-            ((level == "error" and self.config["notifications"]["email"]["on_error"]) or 
-             (level == "info" and self.config["notifications"]["email"]["on_completion"]))):
+        if flags.get("email"):
             self._send_email(
                 subject=f"Media Compressor {level.capitalize()}", 
                 body=message
             )
         
         # Webhook notifications
-        if (self.config["notifications"]["webhook"]["enabled"] and 
-            ((level == "error" and self.config["notifications"]["webhook"]["on_error"]) or 
-             (level == "info" and self.config["notifications"]["webhook"]["on_completion"]))):
+        if flags.get("webhook"):
             self._send_webhook({
                 "level": level,
                 "message": message,
@@ -81,6 +111,15 @@ class NotificationService:
         except Exception as e:
             logger.error(f"Error sending email notification: {str(e)}")
     
+    def _get_free_space_gb(self) -> float:
+        """Get free space in the temp directory, refreshed at most every DISK_USAGE_TTL seconds."""
+        cached_at, free_gb = self._disk_usage_cache
+        now = time.monotonic()
+        if free_gb is None or now - cached_at >= self.DISK_USAGE_TTL:
+            free_gb = shutil.disk_usage(self.config["temp_dir"]).free / (1024**3)
+            self._disk_usage_cache = (now, free_gb)
+        return free_gb
+    
     def _send_webhook(self, data: Dict[str, Any]):
         """
         Send a webhook notification.
@@ -93,14 +132,15 @@ class NotificationService:
             
             # Add additional system info
             data["system_info"] = {
-                "hostname": os.uname().nodename,
-                "free_space_gb": shutil.disk_usage(self.config["temp_dir"]).free / (1024**3)
+                "hostname": self._hostname,
+                "free_space_gb": self._get_free_space_gb()
             }
             
-            response = requests.post(
+            response = self._http.post(
                 webhook_url,
                 json=data,
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json"},
+                timeout=self.WEBHOOK_TIMEOUT
             )
             
             if response.status_code < 200 or response.status_code >= 300:
@@ -3,17 +3,74 @@ import re
 import json
 import os
 import logging
-from typing import List, Dict, Tuple, Optional, Set, Any, Callable
-from datetime import time
+import functools
+from typing import List, Dict, Tuple, Optional, Set, Any, Callable, NamedTuple
+
+try:
+    import orjson
+except ImportError:  # Optional dependency; JSON falls back to the stdlib parser
+    orjson = None
+
 logger = logging.getLogger('MediaCompressor.QualValidator')
 
+# Parses ffprobe/libvmaf JSON straight from bytes; orjson.JSONDecodeError
+# subclasses json.JSONDecodeError, so callers catch the same exception either way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+class VideoStream(NamedTuple):
+    """A video stream reported by ffprobe."""
+    width: int
+    height: int
+    codec: str
+    bit_rate: int
+    fps: float
+    duration: float
+
+class AudioStream(NamedTuple):
+    """An audio stream reported by ffprobe."""
+    codec: str
+    channels: int
+    language: str
+
+class SubtitleStream(NamedTuple):
+    """A subtitle stream reported by ffprobe."""
+    codec: str
+    language: str
+
 class QualityValidator:
     """
     Handles media quality validation using various metrics like VMAF, SSIM, and PSNR.
     This separates the validation logic from the compressor class for better organization.
     """
+    # Aggregate lines the ssim/psnr filters log on stderr, matched on raw bytes
+    _SSIM_RE = re.compile(rb'All:([\d.]+)')
+    _PSNR_RE = re.compile(rb'average:([\d.]+)')
+    
+    # How much of ffmpeg's stderr to search for the aggregate line
+    STDERR_TAIL_BYTES = 4096
+    
+    # ffprobe results kept in memory, keyed by (path, mtime_ns, size)
+    PROBE_CACHE_SIZE = 512
+    
+    # ffprobe fields read when summarizing a file
+    PROBE_ENTRIES = (
+        "format=duration,bit_rate,format_name"
+        ":stream=codec_type,codec_name,width,height,avg_frame_rate,bit_rate,channels,duration"
+        ":stream_tags=language"
+    )
+    
+    # ffmpeg filter behind each validation method
+    METRIC_FILTERS = {"vmaf": "libvmaf", "ssim": "ssim", "psnr": "psnr"}
+    
+    # Methods whose filter the local ffmpeg build provides, probed once per process
+    _supported_methods: Optional[Set[str]] = None
+    
     def __init__(self, config: Dict):
         self.config = config
+        
+        # Per-instance probe cache; a class-level lru_cache would key on self and
+        # keep every validator alive for the life of the process
+        self._probe_cached = functools.lru_cache(maxsize=self.PROBE_CACHE_SIZE)(self._probe_video_info)
     
     def validate_compression(self, original_path: str, compressed_path: str) -> Dict:
         """Validate compression quality using VMAF or SSIM metrics with robust fallbacks."""
@@ -24,10 +81,14 @@ class QualityValidator:
             primary_method = self.config["quality_validation"]["method"].lower()
             threshold = self.config["quality_validation"]["threshold"]
             sample_duration = self.config["quality_validation"]["sample_duration"]
+            n_subsample = self.config["quality_validation"]["n_subsample"]
+            vmaf_threads = self.config["quality_validation"].get("vmaf_threads") or os.cpu_count() or 4
+            vmaf_model_path = self.config["quality_validation"].get("vmaf_model_path")
+            downscale = self.config["quality_validation"]["downscale_for_metric"]
             
             # Get video info for both files to ensure compatibility
-            original_info = self._get_video_info(original_path)
-            compressed_info = self._get_video_info(compressed_path)
+            original_info = self._get_video_info(original_path, fast=True)
+            compressed_info = self._get_video_info(compressed_path, fast=True)
             
             if "error" in original_info or "error" in compressed_info:
                 logger.warning(f"Could not get video info for comparison, assuming acceptable quality")
@@ -41,131 +102,109 @@ class QualityValidator:
                 logger.warning(f"Could not determine duration for comparison, assuming acceptable quality")
                 return {"score": 100, "acceptable": True, "method": "none", "note": "duration error"}
             
-            # Use the shorter duration of the two
+            # Sample from the shorter of the two, starting 10% in (at most 30s) and
+            # shrinking the sample to what remains, but not below 10s
             safe_duration = min(orig_duration, comp_duration)
-            
-            # Calculate safe sampling points
             safe_start = min(30, safe_duration * 0.1)
-            
-            # Ensure we have enough duration for the sample
-            if safe_start + sample_duration > safe_duration:
-                # If the video is too short, reduce sample duration
-                adjusted_duration = max(10, safe_duration - safe_start)
+            adjusted_duration = min(sample_duration, max(10, safe_duration - safe_start))
+            if adjusted_duration != sample_duration:
                 logger.warning(f"Video too short for full sample, reducing sample duration to {adjusted_duration}s")
                 sample_duration = adjusted_duration
             
-            # Try multiple methods in sequence if one fails
-            methods_to_try = []
+            # libvmaf computes VMAF, SSIM and PSNR in a single decode pass; the plain
+            # ssim and psnr filters are only run when libvmaf is unavailable
+            fallbacks = ["ssim", "psnr"]
+            if primary_method == "psnr":
+                fallbacks.reverse()
+            methods_to_try = ["vmaf", *fallbacks]
+            
+            # Skip methods this host cannot run instead of paying an ffmpeg startup
+            # to find out
+            supported = self._get_supported_methods()
+            if vmaf_model_path and not os.path.exists(vmaf_model_path):
+                logger.warning(f"VMAF model not found at {vmaf_model_path}, skipping VMAF")
+                supported = supported - {"vmaf"}
+            methods_to_try = [m for m in methods_to_try if m in supported]
             
-            # Always try the primary method first
-            methods_to_try.append(primary_method)
+            # libvmaf ships vmaf_v0.6.1 built in; a configured model file overrides it
+            vmaf_model = f"path={vmaf_model_path}" if vmaf_model_path else "version=vmaf_v0.6.1"
+            
+            # Both inputs seek to the same point with -ss before -i. The seek stays
+            # frame-accurate because the two files have unrelated keyframes, and a
+            # keyframe-snapped seek would misalign them. A single output -t then
+            # bounds the comparison.
+            input_args = [
+                "-threads", "0", "-ss", str(safe_start), "-i", original_path,
+                "-threads", "0", "-ss", str(safe_start), "-i", compressed_path,
+                "-t", str(sample_duration)
+            ]
             
-            # Add fallback methods
-            for method in ["vmaf", "ssim", "psnr"]:
-                if method != primary_method and method not in methods_to_try:
-                    methods_to_try.append(method)
+            # Metrics on frames above 1440p are memory-bound; scaling both sides to
+            # 1080p width touches a quarter of the pixels and keeps the score ordering
+            ref, dis = "[0:v]", "[1:v]"
+            scale_graph = ""
+            video_streams = original_info.get("video_streams")
+            if downscale and video_streams and min(video_streams[0].width, video_streams[0].height) > 1440:
+                scale_graph = "[0:v]scale=1920:-2:flags=bicubic[ref];[1:v]scale=1920:-2:flags=bicubic[dis];"
+                ref, dis = "[ref]", "[dis]"
             
             # Try each method until one succeeds
             for method in methods_to_try:
                 try:
-                    # Create a temporary output file
-                    temp_dir = self.config["temp_dir"]
-                    os.makedirs(temp_dir, exist_ok=True)
-                    result_json = os.path.join(temp_dir, f"quality_{method}_{int(time.time())}.json")
-                    
                     # Build appropriate command based on method
                     if method == "vmaf":
+                        # libvmaf takes the distorted stream first and the reference second.
+                        # It writes its JSON log straight into our stdout pipe (the null
+                        # muxer writes nothing there), so no temp file is written, read
+                        # back and deleted
                         cmd = [
                             "ffmpeg", "-y", "-v", "error",
-                            "-ss", str(safe_start), "-t", str(sample_duration),
-                            "-i", original_path, 
-                            "-ss", str(safe_start), "-t", str(sample_duration),
-                            "-i", compressed_path,
-                            "-filter_complex", f"libvmaf=log_fmt=json:log_path={result_json}:model=version=vmaf_v0.6.1:n_threads=4",
+                            *input_args,
+                            "-filter_complex", f"{scale_graph}{dis}{ref}libvmaf=feature=name=psnr|name=float_ssim:log_fmt=json:log_path=/dev/stdout:model={vmaf_model}:n_threads={vmaf_threads}:n_subsample={n_subsample}",
                             "-f", "null", "-"
                         ]
-                    elif method == "ssim":
+                    else:
+                        # The ssim and psnr filters log their aggregate line at info
+                        # level when they close; their stats_file only holds per-frame rows
                         cmd = [
-                            "ffmpeg", "-y", "-v", "error",
-                            "-ss", str(safe_start), "-t", str(sample_duration),
-                            "-i", original_path, 
-                            "-ss", str(safe_start), "-t", str(sample_duration),
-                            "-i", compressed_path,
-                            "-filter_complex", "ssim=stats_file=" + result_json,
-                            "-f", "null", "-"
-                        ]
-                    else:  # psnr
-                        cmd = [
-                            "ffmpeg", "-y", "-v", "error",
-                            "-ss", str(safe_start), "-t", str(sample_duration),
-                            "-i", original_path, 
-                            "-ss", str(safe_start), "-t", str(sample_duration),
-                            "-i", compressed_path,
-                            "-filter_complex", "psnr=stats_file=" + result_json,
+                            "ffmpeg", "-y", "-hide_banner", "-nostats", "-v", "info",
+                            *input_args,
+                            "-filter_complex", f"{scale_graph}{dis}{ref}{method}",
                             "-f", "null", "-"
                         ]
                     
                     logger.info(f"Running quality validation using {method}")
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+                    result = subprocess.run(cmd, capture_output=True, timeout=300)
                     
                     # Parse results based on method
-                    if os.path.exists(result_json) and os.path.getsize(result_json) > 0:
-                        with open(result_json, 'r') as f:
-                            content = f.read()
-                            
-                            # Parse for VMAF
-                            if method == "vmaf" and "pooled_metrics" in content:
-                                results = json.loads(content)
-                                score = results["pooled_metrics"]["vmaf"]["mean"]
-                                logger.info(f"VMAF validation successful: score={score}")
-                                
-                                os.remove(result_json)
-                                return {
-                                    "score": score,
-                                    "acceptable": score >= threshold,
-                                    "method": method
-                                }
-                            
-                            # Parse for SSIM
-                            elif method == "ssim":
-                                match = re.search(r'All:([\d.]+)', content)
-                                if match:
-                                    score = float(match.group(1)) * 100
-                                    logger.info(f"SSIM validation successful: score={score}")
-                                    
-                                    os.remove(result_json)
-                                    return {
-                                        "score": score,
-                                        "acceptable": score >= max(threshold * 0.8, 80),
-                                        "method": method
-                                    }
+                    if method == "vmaf":
+                        if b"pooled_metrics" in result.stdout:
+                            pooled = _json_loads(result.stdout)["pooled_metrics"]
+                            metrics = {"vmaf": pooled["vmaf"]["mean"]}
+                            if "float_ssim" in pooled:
+                                metrics["ssim"] = pooled["float_ssim"]["mean"]
+                            if "psnr_y" in pooled:
+                                metrics["psnr"] = pooled["psnr_y"]["mean"]
                             
-                            # Parse for PSNR
-                            elif method == "psnr":
-                                match = re.search(r'average:([\d.]+)', content)
-                                if match:
-                                    psnr_value = float(match.group(1))
-                                    score = min(100, psnr_value * 2) if psnr_value < 50 else 100
-                                    
-                                    logger.info(f"PSNR validation successful: score={score}")
-                                    
-                                    os.remove(result_json)
-                                    return {
-                                        "score": score,
-                                        "acceptable": psnr_value >= 30,
-                                        "method": method
-                                    }
+                            # Judge by the configured metric when the pass produced it
+                            reported = primary_method if primary_method in metrics else "vmaf"
+                            validation = self._score_metric(reported, metrics[reported], threshold)
+                            validation["metrics"] = metrics
+                            return validation
                     
-                    # Clean up
-                    if os.path.exists(result_json):
-                        os.remove(result_json)
+                    else:
+                        # The summary is among the last lines ffmpeg logs, so only the
+                        # tail of stderr needs searching
+                        tail = result.stderr[-self.STDERR_TAIL_BYTES:]
+                        pattern = self._SSIM_RE if method == "ssim" else self._PSNR_RE
+                        match = pattern.search(tail)
+                        if match:
+                            return self._score_metric(method, float(match.group(1)), threshold)
                     
                     logger.warning(f"Quality validation with {method} failed, trying next method")
                     
                 except Exception as e:
                     logger.warning(f"Error in {method} validation: {str(e)}")
-                    if 'result_json' in locals() and os.path.exists(result_json):
-                        os.remove(result_json)
             
             # If we got here, all methods failed
             logger.error(f"All quality validation methods failed for {original_path}")
@@ -187,67 +226,78 @@ class QualityValidator:
                 "note": f"Validation error: {str(e)}"
             }
     
-    def _get_video_info(self, file_path: str) -> Dict:
-        """Get video information using ffprobe."""
-        try:
-            cmd = [
-                "ffprobe", "-v", "quiet", "-print_format", "json",
-                "-show_format", "-show_streams", file_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            
-            # Default structure
-            video_info = {
-                "has_video": False, 
-                "has_audio": False, 
-                "duration_s": 0, 
-                "bitrate": 0,
-                "video_streams": [],
-                "audio_streams": [],
-                "subtitle_streams": []
-            }
-            
-            # Check for valid output
-            if result.returncode != 0 or not result.stdout.strip():
-                logger.warning(f"ffprobe failed for {os.path.basename(file_path)}")
-                return video_info
-                
+    @classmethod
+    def _get_supported_methods(cls) -> Set[str]:
+        """
+        Work out which validation methods the local ffmpeg build can run, once per process.
+        
+        Returns:
+            Set of method names; every method if ffmpeg could not be queried
+        """
+        if cls._supported_methods is None:
+            filters = set()
             try:
-                info = json.loads(result.stdout)
-            except json.JSONDecodeError:
-                logger.warning(f"Could not parse ffprobe JSON output for {os.path.basename(file_path)}")
-                return video_info
-            
-            # Extract format information
-            if "format" in info:
-                format_info = info["format"]
-                
-                # Get duration
-                if "duration" in format_info:
-                    try:
-                        video_info["duration_s"] = float(format_info["duration"])
-                    except (ValueError, TypeError):
-                        pass
-                        
-                # Get bitrate
-                if "bit_rate" in format_info:
-                    try:
-                        video_info["bitrate"] = int(format_info["bit_rate"])
-                    except (ValueError, TypeError):
-                        pass
-                
-                video_info["format_name"] = format_info.get("format_name", "unknown")
+                result = subprocess.run(["ffmpeg", "-hide_banner", "-filters"],
+                                        capture_output=True, text=True, timeout=10)
+                for line in result.stdout.splitlines():
+                    # Filter rows look like " TSC libvmaf  VV->V  Calculate the VMAF ..."
+                    parts = line.split()
+                    if len(parts) >= 3 and "->" in parts[2]:
+                        filters.add(parts[1])
+            except Exception as e:
+                logger.warning(f"Could not list ffmpeg filters: {str(e)}")
             
-            # Process streams
-            for stream in info.get("streams", []):
-                self._process_stream(stream, video_info)
-            
-            # Make one more attempt to get duration if it's still 0
-            if video_info["duration_s"] == 0 and video_info["has_video"]:
-                self._try_alternate_duration_methods(file_path, video_info)
+            if not filters:
+                # Try everything and leave the cache empty so the next validation probes again
+                return set(cls.METRIC_FILTERS)
+            cls._supported_methods = {method for method, name in cls.METRIC_FILTERS.items() if name in filters}
+            logger.info(f"Quality validation methods supported by ffmpeg: {', '.join(sorted(cls._supported_methods)) or 'none'}")
+        return cls._supported_methods
+    
+    def _score_metric(self, method: str, value: float, threshold: float) -> Dict:
+        """
+        Turn a raw metric value into the 0-100 score and verdict reported to callers.
+        
+        Args:
+            method: Metric name ("vmaf", "ssim" or "psnr")
+            value: Pooled metric value (VMAF score, SSIM in 0-1, PSNR in dB)
+            threshold: Configured VMAF-scale quality threshold
+        """
+        if method == "vmaf":
+            score = value
+            acceptable = score >= threshold
+        elif method == "ssim":
+            score = value * 100
+            acceptable = score >= max(threshold * 0.8, 80)
+        else:
+            score = min(100, value * 2) if value < 50 else 100
+            acceptable = value >= 30
+        
+        logger.info(f"{method.upper()} validation successful: score={score}")
+        return {"score": score, "acceptable": acceptable, "method": method}
+    
+    def _get_video_info(self, file_path: str, fast: bool = False) -> Dict:
+        """
+        Get video information using ffprobe, reusing the last probe until the file changes.
+        
+        Args:
+            file_path: Path to the media file
+            fast: Stop at the first video stream; audio and subtitle streams
+                  after it are not listed
+        """
+        try:
+            st = os.stat(file_path)
+            info = self._probe_cached(file_path, st.st_mtime_ns, st.st_size, fast)
             
-            return video_info
+            # Hand out a copy so callers cannot alter the cached entry; the stream records are immutable
+            return {key: list(value) if isinstance(value, list) else value for key, value in info.items()}
         
+        except subprocess.CalledProcessError:
+            logger.warning(f"ffprobe failed for {os.path.basename(file_path)}")
+            return {"error": "ffprobe failed", "has_video": False, "duration_s": 0}
+        except json.JSONDecodeError:
+            logger.warning(f"Could not parse ffprobe JSON output for {os.path.basename(file_path)}")
+            return {"error": "invalid ffprobe output", "has_video": False, "duration_s": 0}
         except subprocess.TimeoutExpired:
             logger.error(f"Timeout getting video info for {os.path.basename(file_path)}")
             return {"error": "ffprobe timeout", "has_video": False, "duration_s": 0}
@@ -255,6 +305,80 @@ class QualityValidator:
             logger.error(f"Error getting video info for {os.path.basename(file_path)}: {str(e)}")
             return {"error": str(e), "has_video": False, "duration_s": 0}
     
+    def _probe_video_info(self, file_path: str, mtime_ns: int, size: int, fast: bool = False) -> Dict:
+        """
+        Run ffprobe on a file and summarize its format and streams.
+        
+        Args:
+            file_path: Path to the media file
+            mtime_ns: Modification time of the file, part of the cache key
+            size: Size of the file in bytes, part of the cache key
+            fast: Stop processing streams once the first video stream is captured
+            
+        Returns:
+            Video info dictionary
+            
+        Raises:
+            subprocess.CalledProcessError: If ffprobe exits with an error
+            json.JSONDecodeError: If ffprobe prints empty or invalid JSON
+            subprocess.TimeoutExpired: If ffprobe does not finish in time
+        
+        Failures raise rather than return a default so the probe cache never keeps them.
+        """
+        # Only ask for the fields _process_stream and the format block read
+        cmd = [
+            "ffprobe", "-v", "quiet", "-print_format", "json",
+            "-show_entries", self.PROBE_ENTRIES, file_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, timeout=60)
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd)
+        
+        info = _json_loads(result.stdout)
+        
+        # Default structure
+        video_info = {
+            "has_video": False, 
+            "has_audio": False, 
+            "duration_s": 0, 
+            "bitrate": 0,
+            "video_streams": [],
+            "audio_streams": [],
+            "subtitle_streams": []
+        }
+        
+        # Extract format information
+        if "format" in info:
+            format_info = info["format"]
+            
+            # Get duration
+            if "duration" in format_info:
+                try:
+                    video_info["duration_s"] = float(format_info["duration"])
+                except (ValueError, TypeError):
+                    pass
+                    
+            # Get bitrate
+            if "bit_rate" in format_info:
+                try:
+                    video_info["bitrate"] = int(format_info["bit_rate"])
+                except (ValueError, TypeError):
+                    pass
+            
+            video_info["format_name"] = format_info.get("format_name", "unknown")
+        
+        # Process streams
+        for stream in info.get("streams", []):
+            self._process_stream(stream, video_info)
+            if fast and video_info["has_video"]:
+                break
+        
+        # Fall back to the longest video stream when the container has no duration
+        if video_info["duration_s"] == 0:
+            video_info["duration_s"] = max((vs.duration for vs in video_info["video_streams"]), default=0)
+        
+        return video_info
+    
     def _process_stream(self, stream: Dict, video_info: Dict):
         """Process a stream from ffprobe output."""
         stream_type = stream.get("codec_type", "unknown")
@@ -283,56 +407,36 @@ class QualityValidator:
             except (ValueError, TypeError):
                 pass
             
-            video_stream = {
-                "width": stream.get("width", 0),
-                "height": stream.get("height", 0),
-                "codec": stream.get("codec_name", "unknown"),
-                "bit_rate": bit_rate,
-                "fps": fps
-            }
+            # Get duration
+            duration = 0
+            try:
+                if "duration" in stream:
+                    duration = float(stream["duration"])
+            except (ValueError, TypeError):
+                pass
+            
+            video_stream = VideoStream(
+                width=stream.get("width", 0),
+                height=stream.get("height", 0),
+                codec=stream.get("codec_name", "unknown"),
+                bit_rate=bit_rate,
+                fps=fps,
+                duration=duration
+            )
             video_info["video_streams"].append(video_stream)
         
         elif stream_type == "audio":
             video_info["has_audio"] = True
-            audio_stream = {
-                "codec": stream.get("codec_name", "unknown"),
-                "channels": stream.get("channels", 0),
-                "language": stream.get("tags", {}).get("language", "unknown")
-            }
+            audio_stream = AudioStream(
+                codec=stream.get("codec_name", "unknown"),
+                channels=stream.get("channels", 0),
+                language=stream.get("tags", {}).get("language", "unknown")
+            )
             video_info["audio_streams"].append(audio_stream)
         
         elif stream_type == "subtitle":
-            subtitle_stream = {
-                "codec": stream.get("codec_name", "unknown"),
-                "language": stream.get("tags", {}).get("language", "unknown")
-            }
+            subtitle_stream = SubtitleStream(
+                codec=stream.get("codec_name", "unknown"),
+                language=stream.get("tags", {}).get("language", "unknown")
+            )
             video_info["subtitle_streams"].append(subtitle_stream)
-    
-    def _try_alternate_duration_methods(self, file_path: str, video_info: Dict):
-        """Try alternative methods to get video duration."""
-        try:
-            # Try alternative ffprobe format
-            cmd = [
-                "ffprobe", "-v", "error", 
-                "-select_streams", "v:0", 
-                "-show_entries", "stream=duration", 
-                "-of", "default=noprint_wrappers=1:nokey=1", 
-                file_path
-            ]
-            duration_result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if duration_result.returncode == 0 and duration_result.stdout.strip():
-                video_info["duration_s"] = float(duration_result.stdout.strip())
-                return
-            
-            # Try to get duration from container
-            container_cmd = [
-                "ffprobe", "-v", "error", 
-                "-show_entries", "format=duration", 
-                "-of", "default=noprint_wrappers=1:nokey=1", 
-                file_path
-            ]
-            container_result = subprocess.run(container_cmd, capture_output=True, text=True, timeout=10)
-            if container_result.returncode == 0 and container_result.stdout.strip():
-                video_info["duration_s"] = float(container_result.stdout.strip())
-        except Exception as e:
-            logger.debug(f"Error getting alternative duration: {str(e)}")
\ No newline at end of file
@@ -3,17 +3,54 @@ import shutil
 import datetime
 import logging
 import subprocess
+import threading
+import time
 from typing import Dict, Any, Optional
 
+try:
+    import pynvml
+except ImportError:  # Optional dependency; GPU load falls back to nvidia-smi
+    pynvml = None
+
 logger = logging.getLogger('MediaCompressor.ResourceMonitor')
 
 class ResourceMonitor:
     """Monitor system resources for media compression operations."""
     
+    # Seconds between background CPU/memory samples
+    SAMPLE_INTERVAL = 1.0
+    
     def __init__(self, config: Dict[str, Any], db_logger=None):
         """Initialize the resource monitor with configuration."""
         self.config = config
         self.db_logger = db_logger  # For database event logging
+        
+        # Latest CPU/memory readings, refreshed by the sampler thread so checks never block
+        psutil.cpu_percent(interval=None)  # Prime the counter
+        self._last_cpu = 0.0
+        self._last_memory = psutil.virtual_memory()
+        self._sampler_thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler_thread.start()
+        
+        # NVML handle for the first GPU, or None on hosts without NVML
+        self._gpu_handle = None
+        if pynvml is not None:
+            try:
+                pynvml.nvmlInit()
+                self._gpu_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+            except Exception as e:
+                logger.debug(f"NVML unavailable, using nvidia-smi for GPU load: {str(e)}")
+    
+    def _sample_loop(self):
+        """Keep the cached CPU and memory readings fresh."""
+        while True:
+            try:
+                # Blocks for SAMPLE_INTERVAL and measures usage over that window
+                self._last_cpu = psutil.cpu_percent(interval=self.SAMPLE_INTERVAL)
+                self._last_memory = psutil.virtual_memory()
+            except Exception as e:
+                logger.debug(f"Error sampling system resources: {str(e)}")
+                time.sleep(self.SAMPLE_INTERVAL)
     
     def check_system_resources(self) -> bool:
         """Check if system has sufficient resources for compression."""
@@ -22,7 +59,7 @@ class ResourceMonitor:
             return False
         
         # Check memory
-        memory = psutil.virtual_memory()
+        memory = self._last_memory
         available_mb = memory.available / (1024 * 1024)
         
         if available_mb < self.config["min_memory_mb"]:
@@ -32,7 +69,7 @@ class ResourceMonitor:
             return False
         
         # Check CPU load
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = self._last_cpu
         if cpu_percent > 90:  # Allow high CPU usage but warn
             logger.warning(f"High CPU usage: {cpu_percent}%")
             if self.db_logger:
@@ -73,19 +110,22 @@ class ResourceMonitor:
     def check_system_load(self) -> bool:
         """Check if system load is low enough to run compression tasks."""
         # Get CPU usage
-        cpu_usage = psutil.cpu_percent(interval=1)
+        cpu_usage = self._last_cpu
         
         # Get memory usage
-        memory_usage = psutil.virtual_memory().percent
+        memory_usage = self._last_memory.percent
         
-        # Get GPU usage (simplified, in production you'd use pynvml or similar)
+        # Get GPU usage
         gpu_usage = 0
         try:
-            gpu_info = subprocess.run(
-                ["nvidia-smi", "--query-gpu=utilization.gpu", "--format=csv,noheader,nounits"],
-                capture_output=True, text=True, check=True
-            )
-            gpu_usage = float(gpu_info.stdout.strip())
+            if self._gpu_handle is not None:
+                gpu_usage = pynvml.nvmlDeviceGetUtilizationRates(self._gpu_handle).gpu
+            else:
+                gpu_info = subprocess.run(
+                    ["nvidia-smi", "--query-gpu=utilization.gpu", "--format=csv,noheader,nounits"],
+                    capture_output=True, text=True, check=True
+                )
+                gpu_usage = float(gpu_info.stdout.strip())
         except Exception:
             # If can't get GPU usage, assume it's available
             pass